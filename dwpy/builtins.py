@@ -35,6 +35,22 @@ def invoke_lambda(function: Callable[..., Any], *candidates: Any) -> Any:
     return function(*candidates[:param_count])
 
 
+def bind_lambda(function: Callable[..., Any], arity: int) -> Callable[..., Any]:
+    """Return ``function`` adapted to be called with exactly ``arity`` candidates.
+
+    Equivalent to ``invoke_lambda`` but resolves the parameter count once, so
+    loops can call the result directly for every item.
+    """
+    param_count = parameter_count(function)
+    if param_count is None or param_count >= arity:
+        return function
+    if param_count == 0:
+        return lambda *_candidates: function()
+    if param_count == 1:
+        return lambda first, *_candidates: function(first)
+    return lambda *candidates: function(*candidates[:param_count])
+
+
 def _hashable_key(value: Any) -> Any:
     if isinstance(value, (str, int, float, bool)) or value is None:
         return value
@@ -242,25 +258,6 @@ def builtin_is_odd(value: Any) -> bool:
     return number % 2 != 0
 
 
-def builtin_is_leap_year(value: Any) -> bool:
-    try:
-        dt = _parse_datetime(value)
-    except ValueError:
-        return False
-    year = dt.year
-    return (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
-
-
-def builtin_is_even(value: Any) -> bool:
-    number = int(_coerce_number(value))
-    return number % 2 == 0
-
-
-def builtin_is_odd(value: Any) -> bool:
-    number = int(_coerce_number(value))
-    return number % 2 != 0
-
-
 def builtin_is_leap_year(value: Any) -> bool:
     if value is None:
         return False
@@ -798,10 +795,15 @@ def builtin_split_by(text: Any, separator: Any) -> Any:
 
 
 def builtin_to(start: Any, end: Any) -> List[Any]:
+    return list(integer_range(start, end))
+
+
+def integer_range(start: Any, end: Any) -> range:
+    """The values of ``start to end``, both ends included, without building a list."""
     start_num = int(_coerce_number(start))
     end_num = int(_coerce_number(end))
     step = 1 if end_num >= start_num else -1
-    return list(range(start_num, end_num + step, step))
+    return range(start_num, end_num + step, step)
 
 
 CORE_FUNCTIONS: Dict[str, Callable[..., Any]] = {
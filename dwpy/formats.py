@@ -3,11 +3,44 @@ from __future__ import annotations
 import csv
 import io
 import json
+import re
+import sys
+import threading
 from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import xml.etree.ElementTree as ET
 
+try:  # pragma: no cover - optional dependency guard
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+ORJSON_AVAILABLE = orjson is not None
+
+try:  # pragma: no cover - optional dependency guard
+    import cysimdjson  # type: ignore
+except Exception:  # pragma: no cover
+    cysimdjson = None
+CYSIMDJSON_AVAILABLE = cysimdjson is not None
+
+try:  # pragma: no cover - optional dependency guard
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pa_csv  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None
+    pa_csv = None
+PYARROW_AVAILABLE = pa is not None
+
+try:  # pragma: no cover - optional dependency guard
+    from lxml import etree as lxml_etree  # type: ignore
+except Exception:  # pragma: no cover
+    lxml_etree = None
+# resolve_entities="internal" (ElementTree's entity behaviour) needs lxml 5.
+LXML_AVAILABLE = lxml_etree is not None and lxml_etree.LXML_VERSION >= (5, 0)
+
+_UTF8_ENCODINGS = {"utf-8", "utf8"}
+
 
 class FormatError(ValueError):
     pass
@@ -51,15 +84,13 @@ class FormatRegistry:
         if aliases:
             for alias in aliases:
                 cls._ALIASES[alias.lower()] = definition.id
+        _lookup_format.cache_clear()
 
     @classmethod
     def get(cls, name: Optional[str]) -> Optional[FormatDefinition]:
         if not name:
             return None
-        key = cls._ALIASES.get(name.lower())
-        if key is None:
-            return None
-        return cls._FORMATS.get(key)
+        return _lookup_format(name)
 
     @classmethod
     def read(cls, value: Any, format_name: str, options: Dict[str, Any]) -> Any:
@@ -86,6 +117,16 @@ class FormatRegistry:
             raise FormatError(f"Failed to render output as {definition.id}: {err}") from err
 
 
+@lru_cache(maxsize=64)
+def _lookup_format(name: str) -> Optional[FormatDefinition]:
+    # Format names come from script directives, so the same few strings are
+    # looked up over and over; caching skips the lower() and both dict probes.
+    key = FormatRegistry._ALIASES.get(name.lower())
+    if key is None:
+        return None
+    return FormatRegistry._FORMATS.get(key)
+
+
 def _register_builtin_formats() -> None:
     FormatRegistry.register(
         FormatDefinition(
@@ -125,24 +166,71 @@ def _register_builtin_formats() -> None:
     )
 
 
+_TEXT_DECODERS: Dict[type, Callable[[Any, Dict[str, Any]], str]] = {
+    str: lambda value, _options: value,
+    bytes: lambda value, options: value.decode(options.get("encoding", "utf-8")),
+    bytearray: lambda value, options: value.decode(options.get("encoding", "utf-8")),
+}
+
+
 def _ensure_text(value: Any, options: Dict[str, Any]) -> str:
-    if isinstance(value, str):
-        return value
-    encoding = options.get("encoding", "utf-8")
-    if isinstance(value, bytes):
-        return value.decode(encoding)
-    if isinstance(value, bytearray):
-        return bytes(value).decode(encoding)
-    raise FormatError("Expected textual input for this format")
+    decoder = _TEXT_DECODERS.get(type(value))
+    if decoder is None:
+        # Subclasses miss the exact-type lookup but are still accepted.
+        for text_type, candidate in _TEXT_DECODERS.items():
+            if isinstance(value, text_type):
+                decoder = candidate
+                break
+        else:
+            raise FormatError("Expected textual input for this format")
+    return decoder(value, options)
 
 
 def _json_reader(value: Any, options: Dict[str, Any]) -> Any:
     if isinstance(value, (dict, list)):
         return value
+    # Big integers, NaN literals and invalid documents rejected by the native
+    # parsers go through the stdlib so results and error messages stay unchanged.
+    if _is_utf8_text(value, options):
+        if CYSIMDJSON_AVAILABLE:
+            try:
+                return _simd_json_loads(value)
+            except (ValueError, RuntimeError):
+                pass
+        elif ORJSON_AVAILABLE:
+            try:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
+                pass
     text = _ensure_text(value, options)
     return json.loads(text)
 
 
+def _is_utf8_text(value: Any, options: Dict[str, Any]) -> bool:
+    if isinstance(value, str):
+        return True
+    if isinstance(value, (bytes, bytearray)):
+        return str(options.get("encoding", "utf-8")).lower() in _UTF8_ENCODINGS
+    return False
+
+
+_SIMD_PARSERS = threading.local()
+
+
+def _simd_json_loads(value: Any) -> Any:
+    # simdjson parsers keep their buffers between documents, so reuse one per thread.
+    json_parser = getattr(_SIMD_PARSERS, "parser", None)
+    if json_parser is None:
+        json_parser = _SIMD_PARSERS.parser = cysimdjson.JSONParser()
+    data = value.encode("utf-8") if isinstance(value, str) else bytes(value)
+    # Export eagerly: the runtime relies on real dict/list values and the lazy
+    # views are invalidated by the next parse on this thread.  Depending on the
+    # version, top-level scalars may already come back as plain Python values.
+    parsed = json_parser.parse(data)
+    export = getattr(parsed, "export", None)
+    return export() if export is not None else parsed
+
+
 def _json_writer(value: Any, options: Dict[str, Any]) -> str:
     indent_opt = options.get("indent")
     indent = None
@@ -151,150 +239,198 @@ def _json_writer(value: Any, options: Dict[str, Any]) -> str:
             indent = int(indent_opt)
         except (TypeError, ValueError) as err:
             raise FormatError("JSON indent must be an integer") from err
+        if indent < 0:
+            indent = None
     ensure_ascii = True
     if "ensure_ascii" in options:
         ensure_ascii = _to_bool(options.get("ensure_ascii"))
     sort_keys = _to_bool(options.get("sort_keys", False))
+    has_xml_nodes, orjson_compatible = _scan_json_value(value)
+    if not has_xml_nodes:
+        # Without XML nodes there is nothing to normalise, so json.dumps produces
+        # exactly what _JSONEncoder would; orjson only on the values let through below.
+        if ORJSON_AVAILABLE and orjson_compatible and not ensure_ascii and indent in (None, 2):
+            # orjson formats floats differently (1e-7 vs 1e-07), writes NaN as null
+            # and serialises dates, UUIDs and dataclasses the stdlib rejects, so it
+            # only sees values without floats and hands anything else to json.dumps.
+            orjson_options = (
+                orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+            if indent == 2:
+                orjson_options |= orjson.OPT_INDENT_2
+            if sort_keys:
+                orjson_options |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(
+                    value, default=_reject_json_value, option=orjson_options
+                ).decode("utf-8")
+            except orjson.JSONEncodeError:
+                pass
+        try:
+            return json.dumps(
+                value,
+                indent=indent,
+                ensure_ascii=ensure_ascii,
+                sort_keys=sort_keys,
+                separators=(",", ":") if indent is None else (",", ": "),
+            )
+        except TypeError:
+            # Mappings that are not dicts, for instance; the Python encoder copes.
+            pass
     encoder = _JSONEncoder(indent=indent, ensure_ascii=ensure_ascii, sort_keys=sort_keys)
     return encoder.encode(value)
 
 
+def _reject_json_value(value: Any) -> Any:
+    # orjson's fallback hook: refuse, so json.dumps reports unsupported types.
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _scan_json_value(value: Any) -> Tuple[bool, bool]:
+    """Return ``(contains XML nodes, only strings, integers, booleans and nulls)``."""
+    orjson_compatible = True
+    pending = [value]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, (XMLNodeDict, XMLNodeList)):
+            return True, False
+        if isinstance(current, Mapping):
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple)):
+            pending.extend(current)
+        elif current is not None and not isinstance(current, (str, int)):
+            orjson_compatible = False
+    return False, orjson_compatible
+
+
+# Characters json.dumps escapes, with and without ensure_ascii.
+_JSON_ESCAPED_CHARS = re.compile(r'[\x00-\x1f"\\]')
+_JSON_ASCII_ESCAPED_CHARS = re.compile(r'[^ -~]|["\\]')
+
+
 class _JSONEncoder:
     def __init__(self, indent: Optional[int], ensure_ascii: bool, sort_keys: bool) -> None:
         self.indent = indent if indent is not None and indent >= 0 else None
         self.ensure_ascii = ensure_ascii
         self.sort_keys = sort_keys
+        self._key_separator = ":" if self.indent is None else ": "
+        self._escaped_chars = _JSON_ASCII_ESCAPED_CHARS if ensure_ascii else _JSON_ESCAPED_CHARS
+        # "\n" plus the indentation for each nesting level ("" when compact),
+        # grown on demand by _line_pad.
+        self._line_pads: List[str] = []
 
     def encode(self, value: Any, level: int = 0) -> str:
-        if isinstance(value, XMLNodeDict):
-            return self._encode_object(value, level)
+        out: List[str] = []
+        self._write(value, out, level)
+        return "".join(out)
+
+    def _write(self, value: Any, out: List[str], level: int) -> None:
         if isinstance(value, Mapping):
-            return self._encode_object(value, level)
-        if isinstance(value, XMLNodeList):
-            return self._encode_array(list(value), level)
-        if isinstance(value, list):
-            return self._encode_array(value, level)
-        if isinstance(value, (str, int, float, bool)) or value is None:
-            return json.dumps(value, ensure_ascii=self.ensure_ascii)
-        return json.dumps(value, ensure_ascii=self.ensure_ascii)
+            self._write_object(value, out, level)
+        elif isinstance(value, list):
+            self._write_array(value, out, level)
+        else:
+            out.append(self._encode_scalar(value))
 
-    def _encode_object(self, obj: Mapping[str, Any], level: int) -> str:
+    def _write_object(self, obj: Mapping[str, Any], out: List[str], level: int) -> None:
         if not obj:
-            return "{}"
-        items = obj.items()
-        if self.sort_keys:
-            items = sorted(items, key=lambda kv: kv[0])
+            out.append("{}")
+            return
         key_values: list[tuple[str, Any]] = []
-        for key, value in items:
+        for key, value in self._ordered_items(obj.items()):
             if isinstance(value, XMLNodeList):
                 for entry in value:
                     key_values.append((key, entry))
             else:
                 key_values.append((key, value))
-        parts = []
-        for key, value in key_values:
-            normalized = self._normalize_value(value)
-            encoded_key = json.dumps(key, ensure_ascii=self.ensure_ascii)
-            encoded_value = self._encode_normalized(normalized, level + 1)
-            if self.indent is None:
-                parts.append(f"{encoded_key}:{encoded_value}")
-            else:
-                pad = " " * self.indent * (level + 1)
-                parts.append(f"{pad}{encoded_key}: {encoded_value}")
-        if self.indent is None:
-            return "{" + ",".join(parts) + "}"
-        else:
-            newline = "\n"
-            closing_pad = " " * self.indent * level
-            return "{" + newline + (",\n".join(parts)) + newline + closing_pad + "}"
+        self._write_members(key_values, out, level)
 
-    def _encode_array(self, items: list[Any], level: int) -> str:
+    def _write_array(self, items: list[Any], out: List[str], level: int) -> None:
         if not items:
-            return "[]"
-        parts = []
-        for item in items:
-            normalized = self._normalize_value(item)
-            encoded = self._encode_normalized(normalized, level + 1)
-            if self.indent is None:
-                parts.append(encoded)
+            out.append("[]")
+            return
+        self._write_elements(items, out, level)
+
+    def _write_normalized(self, value: Any, out: List[str], level: int) -> None:
+        # XML nodes are normalised while they are written: attributes are dropped,
+        # and a node without child elements collapses to its text content.
+        if type(value) is str:
+            # Text leaves are most of an XML-derived document; skip the container checks.
+            out.append(self._encode_scalar(value))
+        elif isinstance(value, XMLNodeDict):
+            children = [
+                (key, child)
+                for key, child in value.items()
+                if key != "#text" and not key.startswith("@")
+            ]
+            if children:
+                self._write_members(self._ordered_items(children), out, level)
+                return
+            text_value = value.get("#text")
+            if text_value is None:
+                out.append('""')
             else:
-                pad = " " * self.indent * (level + 1)
-                parts.append(f"{pad}{encoded}")
-        if self.indent is None:
-            return "[" + ",".join(parts) + "]"
+                self._write_normalized(text_value, out, level)
+        elif isinstance(value, Mapping):
+            if not value:
+                out.append("{}")
+                return
+            self._write_members(self._ordered_items(value.items()), out, level)
+        elif isinstance(value, list):
+            if not value:
+                out.append("[]")
+                return
+            self._write_elements(value, out, level)
         else:
-            newline = "\n"
-            closing_pad = " " * self.indent * level
-            return "[" + newline + (",\n".join(parts)) + newline + closing_pad + "]"
-
-    def _encode_normalized(self, value: Any, level: int) -> str:
-        if isinstance(value, dict):
-            return self._encode_standard_object(value, level)
-        if isinstance(value, list):
-            return self._encode_standard_array(value, level)
+            out.append(self._encode_scalar(value))
+
+    def _encode_scalar(self, value: Any) -> str:
+        # Most XML text needs no escaping; quote it directly instead of going
+        # through json.dumps for every leaf and key.
+        if type(value) is str and self._escaped_chars.search(value) is None:
+            return '"' + value + '"'
         return json.dumps(value, ensure_ascii=self.ensure_ascii)
 
-    def _encode_standard_object(self, obj: Mapping[str, Any], level: int) -> str:
-        if not obj:
-            return "{}"
-        items = obj.items()
+    def _ordered_items(self, items: Iterable[tuple[str, Any]]) -> Iterable[tuple[str, Any]]:
         if self.sort_keys:
-            items = sorted(items, key=lambda kv: kv[0])
-        parts = []
-        for key, value in items:
-            encoded_key = json.dumps(key, ensure_ascii=self.ensure_ascii)
-            encoded_value = self._encode_normalized(value, level + 1)
-            if self.indent is None:
-                parts.append(f"{encoded_key}:{encoded_value}")
-            else:
-                pad = " " * self.indent * (level + 1)
-                parts.append(f"{pad}{encoded_key}: {encoded_value}")
-        if self.indent is None:
-            return "{" + ",".join(parts) + "}"
-        newline = "\n"
-        closing_pad = " " * self.indent * level
-        return "{" + newline + (",\n".join(parts)) + newline + closing_pad + "}"
-
-    def _encode_standard_array(self, items: list[Any], level: int) -> str:
-        if not items:
-            return "[]"
-        parts = []
+            return sorted(items, key=lambda kv: kv[0])
+        return items
+
+    def _write_members(self, pairs: Iterable[tuple[str, Any]], out: List[str], level: int) -> None:
+        inner_pad = self._line_pad(level + 1)
+        item_separator = "," + inner_pad
+        key_separator = self._key_separator
+        out.append("{" + inner_pad)
+        first = True
+        for key, value in pairs:
+            if not first:
+                out.append(item_separator)
+            first = False
+            out.append(self._encode_scalar(key))
+            out.append(key_separator)
+            self._write_normalized(value, out, level + 1)
+        out.append(self._line_pad(level) + "}")
+
+    def _write_elements(self, items: Iterable[Any], out: List[str], level: int) -> None:
+        inner_pad = self._line_pad(level + 1)
+        item_separator = "," + inner_pad
+        out.append("[" + inner_pad)
+        first = True
         for item in items:
-            encoded = self._encode_normalized(item, level + 1)
+            if not first:
+                out.append(item_separator)
+            first = False
+            self._write_normalized(item, out, level + 1)
+        out.append(self._line_pad(level) + "]")
+
+    def _line_pad(self, level: int) -> str:
+        pads = self._line_pads
+        while len(pads) <= level:
             if self.indent is None:
-                parts.append(encoded)
+                pads.append("")
             else:
-                pad = " " * self.indent * (level + 1)
-                parts.append(f"{pad}{encoded}")
-        if self.indent is None:
-            return "[" + ",".join(parts) + "]"
-        newline = "\n"
-        closing_pad = " " * self.indent * level
-        return "[" + newline + (",\n".join(parts)) + newline + closing_pad + "]"
-
-    def _normalize_value(self, value: Any) -> Any:
-        if isinstance(value, XMLNodeDict):
-            text_value = None
-            normalized_children: Dict[str, Any] = {}
-            for key, child in value.items():
-                if key == "#text":
-                    text_value = self._normalize_value(child)
-                    continue
-                if key.startswith("@"):
-                    continue
-                normalized_children[key] = self._normalize_value(child)
-            if normalized_children:
-                return normalized_children
-            if text_value is not None:
-                return text_value
-            return ""
-        if isinstance(value, XMLNodeList):
-            return [self._normalize_value(item) for item in value]
-        if isinstance(value, list):
-            return [self._normalize_value(item) for item in value]
-        if isinstance(value, Mapping):
-            return {key: self._normalize_value(val) for key, val in value.items()}
-        return value
+                pads.append("\n" + " " * (self.indent * len(pads)))
+        return pads[level]
 
 
 def _csv_reader(value: Any, options: Dict[str, Any]) -> Any:
@@ -304,12 +440,58 @@ def _csv_reader(value: Any, options: Dict[str, Any]) -> Any:
     delimiter = str(options.get("separator", ",")) or ","
     quote = str(options.get("quote", '"')) or '"'
     header = _to_bool(options.get("header", True))
+    if header and PYARROW_AVAILABLE and str(options.get("engine", "python")).lower() == "pyarrow":
+        records = _arrow_csv_records(text, delimiter, quote)
+        if records is not None:
+            return records
     stream = io.StringIO(text)
-    if header:
-        reader = csv.DictReader(stream, delimiter=delimiter, quotechar=quote)
-        return [dict(row) for row in reader]
     reader = csv.reader(stream, delimiter=delimiter, quotechar=quote)
-    return [row for row in reader]
+    if not header:
+        return list(reader)
+    # Interned column names let every row dict share the same key objects.
+    fieldnames = [sys.intern(name) for name in next(reader, [])]
+    width = len(fieldnames)
+    records: List[Dict[Any, Any]] = []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) == width:
+            records.append(dict(zip(fieldnames, row)))
+        else:
+            records.append(_ragged_csv_record(fieldnames, row))
+    return records
+
+
+def _ragged_csv_record(fieldnames: List[str], row: List[str]) -> Dict[Any, Any]:
+    # Mirror csv.DictReader: missing fields become None, extra ones are kept under None.
+    record: Dict[Any, Any] = dict(zip(fieldnames, row))
+    if len(row) > len(fieldnames):
+        record[None] = row[len(fieldnames) :]
+    else:
+        for name in fieldnames[len(row) :]:
+            record[name] = None
+    return record
+
+
+def _arrow_csv_records(text: str, delimiter: str, quote: str) -> Optional[List[Dict[str, Any]]]:
+    # Columns are read as strings so values match the csv module; inputs Arrow
+    # rejects (ragged rows, for instance) return None and use the stdlib path.
+    column_names = next(csv.reader(io.StringIO(text), delimiter=delimiter, quotechar=quote), None)
+    if column_names is None:
+        return []
+    if not column_names:
+        return None
+    try:
+        table = pa_csv.read_csv(
+            pa.py_buffer(text.encode("utf-8")),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter, quote_char=quote),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in column_names},
+            ),
+        )
+    except (pa.ArrowInvalid, ValueError):
+        return None
+    return table.to_pylist()
 
 
 def _csv_writer(value: Any, options: Dict[str, Any]) -> str:
@@ -349,48 +531,88 @@ def _csv_writer(value: Any, options: Dict[str, Any]) -> str:
             quotechar=quote,
             lineterminator=newline if newline is not None else "\n",
         )
-        for row in rows:
-            if isinstance(row, (list, tuple)):
-                writer.writerow(list(row))
-            else:
-                writer.writerow([row])
+        writer.writerows(row if isinstance(row, (list, tuple)) else (row,) for row in rows)
     return output.getvalue()
 
 
 def _xml_reader(value: Any, options: Dict[str, Any]) -> Any:
     text = _ensure_text(value, options)
     try:
-        root = ET.fromstring(text)
-    except ET.ParseError as err:
+        if LXML_AVAILABLE:
+            root = lxml_etree.fromstring(text.encode("utf-8"), _lxml_parser())
+        else:
+            root = ET.fromstring(text)
+    except _XML_PARSE_ERRORS as err:
         raise FormatError(f"Invalid XML input: {err}") from err
     return {root.tag: _element_to_value(root)}
 
 
-def _element_to_value(element: ET.Element) -> Any:
-    children = list(element)
-    text = (element.text or "").strip()
-    if not children and not element.attrib:
-        return text
-    result: XMLNodeDict = XMLNodeDict()
-    for attr_name, attr_value in element.attrib.items():
-        result[f"@{attr_name}"] = attr_value
-    for child in children:
-        child_value = _element_to_value(child)
-        existing = result.get(child.tag)
-        if existing is None:
-            result[child.tag] = child_value
+_XML_PARSE_ERRORS: tuple[type[Exception], ...] = (
+    (ET.ParseError, lxml_etree.XMLSyntaxError) if LXML_AVAILABLE else (ET.ParseError,)
+)
+_LXML_PARSERS = threading.local()
+
+
+def _lxml_parser() -> Any:
+    # Match ElementTree: comments and processing instructions are dropped, the
+    # already-decoded text wins over the declared encoding, only internal
+    # entities are expanded, and libxml2's depth and text-size limits are lifted.
+    xml_parser = getattr(_LXML_PARSERS, "parser", None)
+    if xml_parser is None:
+        xml_parser = _LXML_PARSERS.parser = lxml_etree.XMLParser(
+            encoding="utf-8",
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities="internal",
+            no_network=True,
+            huge_tree=True,
+        )
+    return xml_parser
+
+
+def _element_to_value(root: ET.Element) -> Any:
+    # Post-order walk with an explicit stack of (element, node, children) frames,
+    # so deep documents do not pay for (or overflow) Python recursion.
+    stack = [(root, _new_xml_node(root), iter(root))]
+    while True:
+        element, node, children = stack[-1]
+        child = next(children, None)
+        if child is not None:
+            stack.append((child, _new_xml_node(child), iter(child)))
+            continue
+        stack.pop()
+        text = (element.text or "").strip()
+        value: Any
+        if not node:
+            value = text
         else:
-            if not isinstance(existing, XMLNodeList):
-                node_list = XMLNodeList()
-                node_list.append(existing)
-                result[child.tag] = node_list
-            result[child.tag].append(child_value)
-    if text:
-        if children or element.attrib:
-            result["#text"] = text
+            if text:
+                node["#text"] = text
+            value = node
+        if not stack:
+            return value
+        parent = stack[-1][1]
+        # Tags repeat across the document; interning makes every node share one key object.
+        tag = sys.intern(element.tag)
+        existing = parent.get(tag)
+        if existing is None:
+            parent[tag] = value
+        elif type(existing) is XMLNodeList:
+            existing.append(value)
         else:
-            return text
-    return result
+            parent[tag] = XMLNodeList((existing, value))
+
+
+def _new_xml_node(element: ET.Element) -> XMLNodeDict:
+    node = XMLNodeDict()
+    for attr_name, attr_value in element.attrib.items():
+        node[_attr_key(attr_name)] = attr_value
+    return node
+
+
+@lru_cache(maxsize=1024)
+def _attr_key(name: str) -> str:
+    return sys.intern("@" + name)
 
 
 def _xml_writer(value: Any, options: Dict[str, Any]) -> str:
@@ -404,42 +626,47 @@ def _xml_writer(value: Any, options: Dict[str, Any]) -> str:
     return ET.tostring(element, encoding="unicode")
 
 
-def _populate_xml_element(element: ET.Element, value: Any) -> None:
-    if isinstance(value, Mapping):
-        for key, child_value in value.items():
-            if key.startswith("@"):
-                element.set(key[1:], str(child_value))
-                continue
-            if key == "#text":
-                element.text = str(child_value)
-                continue
-            values = child_value if isinstance(child_value, list) else [child_value]
-            for item in values:
-                child_el = ET.SubElement(element, key)
-                _populate_xml_element(child_el, item)
-        if not element.text:
-            element.text = ""
-        return
-    if isinstance(value, list):
-        for item in value:
-            child_el = ET.SubElement(element, "item")
-            _populate_xml_element(child_el, item)
+def _populate_xml_element(root: ET.Element, root_value: Any) -> None:
+    # Explicit work stack instead of recursion. Child elements are created in
+    # order while their parent is processed, so the pop order does not matter.
+    pending = [(root, root_value)]
+    while pending:
+        element, value = pending.pop()
+        if isinstance(value, Mapping):
+            for key, child_value in value.items():
+                if key.startswith("@"):
+                    element.set(key[1:], str(child_value))
+                    continue
+                if key == "#text":
+                    element.text = str(child_value)
+                    continue
+                values = child_value if isinstance(child_value, list) else (child_value,)
+                for item in values:
+                    pending.append((ET.SubElement(element, key), item))
+        elif isinstance(value, list):
+            for item in value:
+                pending.append((ET.SubElement(element, "item"), item))
+        else:
+            element.text = "" if value is None else str(value)
+            continue
         if not element.text:
             element.text = ""
-        return
-    element.text = "" if value is None else str(value)
+
+
+_TRUE_STRINGS = frozenset(("true", "yes", "1"))
+_FALSE_STRINGS = frozenset(("false", "no", "0"))
 
 
 def _to_bool(value: Any) -> bool:
-    if isinstance(value, bool):
+    if value is True or value is False:
         return value
     if value is None:
         return False
     if isinstance(value, str):
         lowered = value.lower()
-        if lowered in {"true", "yes", "1"}:
+        if lowered in _TRUE_STRINGS:
             return True
-        if lowered in {"false", "no", "0"}:
+        if lowered in _FALSE_STRINGS:
             return False
     return bool(value)
 
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import re
+import sys
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 
 class ParseError(ValueError):
@@ -12,18 +15,18 @@ class ParseError(ValueError):
         self.column = column
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclaration:
     name: str
     expression: "Expression"
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportDirective:
     raw: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDeclaration:
     name: str
     parameters: List["Parameter"]
@@ -31,7 +34,7 @@ class FunctionDeclaration:
     return_type: Optional["TypeSpec"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Header:
     version: str
     output: Optional[str]
@@ -42,150 +45,215 @@ class Header:
 
 
 
-@dataclass
+@dataclass(slots=True)
 class Script:
     header: Header
     body: "Expression"
 
 
 class Expression:
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Parameter:
     name: str
     default: Optional["Expression"] = None
     type_annotation: Optional["TypeSpec"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeSpec:
     name: str
     generics: List["TypeSpec"]
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeCoercion(Expression):
     expression: "Expression"
     target: TypeSpec
     options: Optional["Expression"]
 
 
-@dataclass
+@dataclass(slots=True)
 class LambdaExpression(Expression):
     parameters: List[Parameter]
     body: "Expression"
 
 
-@dataclass
+@dataclass(slots=True)
 class ObjectLiteral(Expression):
     fields: List[Tuple[Expression, Expression]]
 
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(Expression):
     name: str
     line: int = 0
     column: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Placeholder(Expression):
     level: int
     line: int = 0
     column: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class StringLiteral(Expression):
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class InterpolatedString(Expression):
     parts: List[Expression]  # Mix of StringLiteral and other expressions
 
 
-@dataclass
+@dataclass(slots=True)
 class NumberLiteral(Expression):
     value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class BooleanLiteral(Expression):
     value: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class NullLiteral(Expression):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ListLiteral(Expression):
     elements: List[Expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyAccess(Expression):
     value: Expression
     attribute: str
     null_safe: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexAccess(Expression):
     value: Expression
     index: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionCall(Expression):
     function: Expression
     arguments: List[Expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class DefaultOp(Expression):
     left: Expression
     right: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class IfExpression(Expression):
     condition: Expression
     when_true: Expression
     when_false: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchPattern:
     binding: Optional[str] = None
     matcher: Optional[Expression] = None
     guard: Optional[Expression] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchCase:
     pattern: Optional[MatchPattern]
     expression: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchExpression(Expression):
     value: Expression
     cases: List[MatchCase]
 
 
-Token = Tuple[str, Optional[str], int, int]
-
-
+class Token(NamedTuple):
+    kind: str
+    value: Optional[str]
+    line: int
+    column: int
+
+
+class TokenStream:
+    """Tokens stored column-wise.
+
+    The parser mostly looks at kinds and values, so those live in plain lists.
+    Positions are only needed for node locations and errors, so each token keeps
+    just its source offset and ``position`` maps it to a line and column through
+    the sorted offsets at which lines start.  Indexing still yields ``Token``
+    tuples.
+    """
+
+    __slots__ = ("kinds", "values", "offsets", "line_starts")
+
+    def __init__(self, tokens: Iterable[Token] = (), line_starts: Optional[List[int]] = None):
+        self.kinds: List[str] = []
+        self.values: List[Optional[str]] = []
+        self.offsets: "array[int]" = array("i")
+        self.line_starts: List[int] = [0] if line_starts is None else line_starts
+        for token in tokens:
+            self.append(token)
+
+    def append(self, token: Token) -> None:
+        """Append a token given by line and column, after every token already held."""
+        kind, value, line, column = token
+        line_starts = self.line_starts
+        offsets = self.offsets
+        while len(line_starts) < line:
+            # No source text backs these tokens, so give each new line an offset
+            # past everything before it.
+            line_starts.append(max(line_starts[-1], offsets[-1] if offsets else 0) + 1)
+        self.kinds.append(kind)
+        self.values.append(value)
+        offsets.append(line_starts[line - 1] + column - 1)
+
+    def position(self, index: int) -> Tuple[int, int]:
+        return self.locate(self.offsets[index])
+
+    def locate(self, offset: int) -> Tuple[int, int]:
+        """Line and column of a source offset."""
+        line_starts = self.line_starts
+        line = bisect_right(line_starts, offset)
+        return line, offset - line_starts[line - 1] + 1
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(self.kinds[index], self.values[index], *self.position(index))
+
+    def __iter__(self) -> Iterator[Token]:
+        return map(self.__getitem__, range(len(self.kinds)))
+
+
+# Each match swallows the whitespace in front of its token; the WHITESPACE
+# alternative only matches a run with no token after it.  Alternatives are tried
+# in order, so the most frequent ones come first.  Only alternatives that can
+# start with the same character need a fixed relative order.
 TOKEN_REGEX = re.compile(
     r"""
-    (?P<WHITESPACE>\s+)
+    \s*
+    (?:
+    (?P<IDENT>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<LINE_COMMENT>//[^\n]*)
+  | (?P<BLOCK_COMMENT>(?s:/\*.*?\*/))
+  | (?P<UNTERMINATED_COMMENT>/\*)
   | (?P<NUMBER>\d+(?:\.\d+)?)
-  | (?P<STRING>"([^"\\]|\\.)*"|'([^'\\]|\\.)*')
+  | (?P<STRING>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
   | (?P<DIFF>--)
   | (?P<SAFE_DOT>\?\.)
   | (?P<CONCAT>\+\+)
@@ -194,317 +262,299 @@ TOKEN_REGEX = re.compile(
   | (?P<EQ>==)
   | (?P<NEQ>!=)
   | (?P<ARROW>->)
-  | (?P<DIV>/)
-  | (?P<GT>>)
-  | (?P<LT><)
-  | (?P<LBRACE>\{)
-  | (?P<RBRACE>\})
-  | (?P<LBRACKET>\[)
-  | (?P<RBRACKET>\])
-  | (?P<LPAREN>\()
-  | (?P<RPAREN>\))
-  | (?P<COLON>:)
-  | (?P<COMMA>,)
-  | (?P<DOT>\.)
-  | (?P<PLUS>\+)
-  | (?P<STAR>\*)
-  | (?P<AT>@)
-  | (?P<EQUAL>=)
+  | (?P<PUNCT>[/><{}\[\]():,.+*@=])
   | (?P<DOLLAR>\$\$?)
-  | (?P<IDENT>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<WHITESPACE>\s+)
+    )
   """,
     re.VERBOSE,
 )
 
+# Token kind for each capture group, indexed by ``match.lastindex``.  Every group in
+# TOKEN_REGEX is named, so the index identifies the alternative that matched.
+# Interned so comparisons against the kind literals in the parser hit the identity fast path.
+GROUP_NAMES: Tuple[str, ...] = tuple(
+    sys.intern(name)
+    for name in sorted(TOKEN_REGEX.groupindex, key=TOKEN_REGEX.groupindex.__getitem__)
+)
 
-class Tokenizer:
-    def __init__(self, source: str):
-        self.source = source
-        self.pos = 0
-        self.line = 1
-        self.column = 1
-
-    def tokens(self) -> List[Token]:
-        tokens: List[Token] = []
-        length = len(self.source)
-        while self.pos < length:
-            if self.source.startswith("//", self.pos):
-                comment_end = self.source.find("\n", self.pos)
-                if comment_end == -1:
-                    segment = self.source[self.pos :]
-                    self._advance(segment)
-                    self.pos = length
-                else:
-                    segment = self.source[self.pos : comment_end]
-                    self._advance(segment)
-                    self.pos = comment_end
-                continue
-            if self.source.startswith("/*", self.pos):
-                end_index = self.source.find("*/", self.pos + 2)
-                if end_index == -1:
-                    raise ParseError(
-                        f"Unterminated block comment at line {self.line}, column {self.column}",
-                        self.line,
-                        self.column,
-                    )
-                segment = self.source[self.pos : end_index + 2]
-                self._advance(segment)
-                self.pos = end_index + 2
-                continue
-
-            match = TOKEN_REGEX.match(self.source, self.pos)
-            if not match:
-                raise ParseError(
-                    f"Unexpected token at line {self.line}, column {self.column}",
-                    self.line,
-                    self.column,
-                )
 
-            kind = match.lastgroup or ""
-            text = match.group(kind)
-            start_line = self.line
-            start_column = self.column
-            self._advance(text)
-            self.pos = match.end()
+# Kinds of the one-character tokens matched together by the PUNCT alternative.
+PUNCTUATION_KINDS: Dict[str, str] = {
+    "/": "DIV",
+    ">": "GT",
+    "<": "LT",
+    "{": "LBRACE",
+    "}": "RBRACE",
+    "[": "LBRACKET",
+    "]": "RBRACKET",
+    "(": "LPAREN",
+    ")": "RPAREN",
+    ":": "COLON",
+    ",": "COMMA",
+    ".": "DOT",
+    "+": "PLUS",
+    "*": "STAR",
+    "@": "AT",
+    "=": "EQUAL",
+}
 
-            if kind == "WHITESPACE":
-                continue
+_NEWLINE = re.compile("\n")
 
-            if kind == "IDENT":
-                if text == "default":
-                    tokens.append(("DEFAULT", None, start_line, start_column))
-                    continue
-                if text in ("true", "false"):
-                    tokens.append(("BOOLEAN", text, start_line, start_column))
-                    continue
-                if text == "null":
-                    tokens.append(("NULL", None, start_line, start_column))
-                    continue
+# Token kinds matched only to be skipped.
+_TRIVIA_KINDS = frozenset({"WHITESPACE", "LINE_COMMENT", "BLOCK_COMMENT"})
 
-            tokens.append((kind, text, start_line, start_column))
 
-        tokens.append(("EOF", None, self.line, self.column))
-        return tokens
+class Tokenizer:
+    def __init__(self, source: str):
+        self.source: str = source
+        self.pos: int = 0
+        self.line: int = 1
+        self.column: int = 1
+
+    def tokens(self) -> TokenStream:
+        source = self.source
+        stream = TokenStream(
+            line_starts=[0, *(match.end() for match in _NEWLINE.finditer(source))]
+        )
+        add_kind = stream.kinds.append
+        add_value = stream.values.append
+        add_offset = stream.offsets.append
+        group_names = GROUP_NAMES
+        pos = self.pos
+        for match in TOKEN_REGEX.finditer(source, pos):
+            if match.start() != pos:
+                # finditer skipped over text that no token pattern accepts.
+                break
+            # Every alternative is a named group, so a match always sets lastindex.
+            group_index: int = match.lastindex  # type: ignore[assignment]
+            kind = group_names[group_index - 1]
+            pos = match.end()
+            if kind in _TRIVIA_KINDS:
+                continue
+            token_start = match.start(group_index)
+            if kind == "UNTERMINATED_COMMENT":
+                line, column = stream.locate(token_start)
+                raise ParseError(
+                    f"Unterminated block comment at line {line}, column {column}",
+                    line,
+                    column,
+                )
 
-    def _advance(self, text: str) -> None:
-        for char in text:
-            if char == "\n":
-                self.line += 1
-                self.column = 1
-            else:
-                self.column += 1
+            text: str = match.group(group_index)
+            value: Optional[str] = text
+            if kind == "PUNCT":
+                kind = PUNCTUATION_KINDS[text]
+            elif kind == "IDENT":
+                # Identifiers are compared against keyword literals and used as scope keys.
+                value = sys.intern(text)
+                if value == "default":
+                    kind, value = "DEFAULT", None
+                elif value == "true" or value == "false":
+                    kind = "BOOLEAN"
+                elif value == "null":
+                    kind, value = "NULL", None
+
+            add_kind(kind)
+            add_value(value)
+            add_offset(token_start)
+
+        self.pos = pos
+        self.line, self.column = stream.locate(pos)
+        if pos < len(source):
+            raise ParseError(
+                f"Unexpected token at line {self.line}, column {self.column}",
+                self.line,
+                self.column,
+            )
+        add_kind("EOF")
+        add_value(None)
+        add_offset(pos)
+        return stream
 
 
 class Parser:
-    def __init__(self, tokens: Sequence[Token]):
-        self.tokens = list(tokens)
-        self.index = 0
+    def __init__(self, tokens: Union[TokenStream, Sequence[Token]]):
+        if not isinstance(tokens, TokenStream):
+            tokens = TokenStream(tokens)
+        self.tokens: TokenStream = tokens
+        self.kinds: List[str] = tokens.kinds
+        self.values: List[Optional[str]] = tokens.values
+        self.index: int = 0
+        self._closing_parens: Optional[List[int]] = None
+        # parse_expression outcome per start index: (expression, end index) or (error, -1).
+        self._expression_memo: Dict[int, Tuple[Union[Expression, ParseError], int]] = {}
 
     def current(self) -> Token:
         return self.tokens[self.index]
 
-    def advance(self) -> Token:
-        token = self.current()
-        if token[0] != "EOF":
+    def current_kind(self) -> str:
+        return self.kinds[self.index]
+
+    def current_value(self) -> Optional[str]:
+        return self.values[self.index]
+
+    def position(self, index: Optional[int] = None) -> Tuple[int, int]:
+        if index is None:
+            index = self.index
+        return self.tokens.position(index)
+
+    def advance(self) -> None:
+        # Parse methods that have already checked the current kind step over it
+        # with ``self.index += 1`` directly; EOF is never consumed.
+        if self.kinds[self.index] != "EOF":
             self.index += 1
-        return token
 
-    def expect(self, kind: str) -> Token:
-        token = self.current()
-        if token[0] != kind:
+    def expect(self, kind: str) -> Optional[str]:
+        """Consume a token of ``kind`` and return its value."""
+        index = self.index
+        found = self.kinds[index]
+        if found != kind:
+            line, column = self.position(index)
             raise ParseError(
-                f"Expected {kind} but found {token[0]} at line {token[2]}, column {token[3]}",
-                token[2],
-                token[3],
+                f"Expected {kind} but found {found} at line {line}, column {column}",
+                line,
+                column,
             )
-        self.advance()
-        return token
+        if found != "EOF":
+            self.index = index + 1
+        return self.values[index]
 
     def match(self, kind: str) -> bool:
-        if self.current()[0] == kind:
-            self.advance()
-            return True
-        return False
+        index = self.index
+        if self.kinds[index] != kind:
+            return False
+        if kind != "EOF":
+            self.index = index + 1
+        return True
 
     def parse_expression_eof(self) -> Expression:
         expr = self.parse_expression()
-        if self.current()[0] != "EOF":
-            token = self.current()
+        if self.current_kind() != "EOF":
+            line, column = self.position()
             raise ParseError(
-                f"Unexpected tokens after expression at line {token[2]}, column {token[3]}",
-                token[2],
-                token[3],
+                f"Unexpected tokens after expression at line {line}, column {column}",
+                line,
+                column,
             )
         return expr
 
     def parse_expression(self) -> Expression:
-        return self.parse_if_expression()
+        # Lambda detection can backtrack and re-parse the same span, and the
+        # token stream never changes, so each start index is parsed at most once.
+        start = self.index
+        cached = self._expression_memo.get(start)
+        if cached is not None:
+            result, end = cached
+            if end < 0:
+                raise result  # type: ignore[misc]
+            self.index = end
+            return result  # type: ignore[return-value]
+        try:
+            expr = self.parse_if_expression()
+        except ParseError as err:
+            self._expression_memo[start] = (err, -1)
+            raise
+        self._expression_memo[start] = (expr, self.index)
+        return expr
 
     def parse_if_expression(self) -> Expression:
-        token = self.current()
-        token_type = token[0]
-        token_value = token[1]
-        if token_type == "IDENT" and token_value == "if":
-            self.advance()
+        index = self.index
+        if self.kinds[index] == "IDENT" and self.values[index] == "if":
+            self.index += 1
             self.expect("LPAREN")
             condition = self.parse_expression()
             self.expect("RPAREN")
             when_true = self.parse_expression()
-            else_token = self.current()
-            else_token_type = else_token[0]
-            else_token_value = else_token[1]
-            if else_token_type != "IDENT" or else_token_value != "else":
+            if self.current_kind() != "IDENT" or self.current_value() != "else":
+                line, column = self.position()
                 raise ParseError(
-                    f"Expected else branch in if expression at line {else_token[2]}, column {else_token[3]}",
-                    else_token[2],
-                    else_token[3],
+                    f"Expected else branch in if expression at line {line}, column {column}",
+                    line,
+                    column,
                 )
-            self.advance()
+            self.index += 1
             when_false = self.parse_expression()
             return IfExpression(condition=condition, when_true=when_true, when_false=when_false)
-        return self.parse_default()
-
-    def parse_default(self) -> Expression:
-        expr = self.parse_comparison()
-        while self.match("DEFAULT"):
-            right = self.parse_comparison()
-            expr = DefaultOp(left=expr, right=right)
-        return expr
-
-    def parse_comparison(self) -> Expression:
-        expr = self.parse_additive()
-        operator_map = {
-            "EQ": "_binary_eq",
-            "NEQ": "_binary_neq",
-            "GT": "_binary_gt",
-            "LT": "_binary_lt",
-            "GTE": "_binary_gte",
-            "LTE": "_binary_lte",
-        }
-        while True:
-            token_type = self.current()[0]
-            if token_type in operator_map:
-                operator_name = operator_map[token_type]
-                self.advance()
-                right = self.parse_additive()
-                expr = FunctionCall(
-                    function=Identifier(name=operator_name),
-                    arguments=[expr, right],
-                )
-            else:
-                break
-        return expr
+        return self.parse_binary()
 
-    def parse_additive(self) -> Expression:
-        expr = self.parse_multiplicative()
-        while True:
-            token_type = self.current()[0]
-            if token_type == "PLUS":
-                plus_token = self.current()
-                self.advance()
-                right = self.parse_multiplicative()
-                expr = FunctionCall(
-                    function=Identifier(
-                        name="_binary_plus",
-                        line=plus_token[2],
-                        column=plus_token[3],
-                    ),
-                    arguments=[expr, right],
-                )
-            elif token_type == "CONCAT":
-                self.advance()
-                right = self.parse_multiplicative()
-                expr = FunctionCall(
-                    function=Identifier(name="_binary_concat"),
-                    arguments=[expr, right],
-                )
-            elif token_type == "DIFF":
-                self.advance()
-                right = self.parse_multiplicative()
-                expr = FunctionCall(
-                    function=Identifier(name="_binary_diff"),
-                    arguments=[expr, right],
-                )
-            else:
-                break
-        return expr
-
-    def parse_multiplicative(self) -> Expression:
+    def parse_binary(self, min_precedence: int = 1) -> Expression:
+        """Parse ``default`` and the arithmetic/comparison operators by precedence climbing."""
         expr = self.parse_postfix()
+        kinds = self.kinds
         while True:
-            token_type = self.current()[0]
-            if token_type == "STAR":
-                self.advance()
-                right = self.parse_postfix()
-                expr = FunctionCall(
-                    function=Identifier(name="_binary_times"),
-                    arguments=[expr, right],
-                )
-            elif token_type == "DIV":
-                self.advance()
-                right = self.parse_postfix()
-                expr = FunctionCall(
-                    function=Identifier(name="_binary_divide"),
-                    arguments=[expr, right],
-                )
-            else:
+            operator_index = self.index
+            operator_kind = kinds[operator_index]
+            precedence = BINARY_PRECEDENCE.get(operator_kind, 0)
+            if precedence < min_precedence:
                 break
+            self.index = operator_index + 1
+            right = self.parse_binary(precedence + 1)
+            if operator_kind == "DEFAULT":
+                expr = DefaultOp(left=expr, right=right)
+                continue
+            operator_name = BINARY_OPERATORS[operator_kind]
+            if operator_kind == "PLUS":
+                # The runtime reports the position of failing additions.
+                line, column = self.position(operator_index)
+                function = Identifier(name=operator_name, line=line, column=column)
+            else:
+                function = OPERATOR_IDENTIFIERS[operator_name]
+            expr = FunctionCall(function=function, arguments=[expr, right])
         return expr
 
     def parse_postfix(self) -> Expression:
         expr = self.parse_primary()
+        kinds = self.kinds
         while True:
-            token = self.current()
-            token_type = token[0]
-            token_value = token[1]
+            token_type = kinds[self.index]
+            if token_type not in POSTFIX_TOKEN_KINDS:
+                break
+            token_value = self.values[self.index]
             if token_type == "IDENT" and token_value == "as":
-                self.advance()
+                self.index += 1
                 target_type = self._parse_type_spec()
                 options_expr: Optional[Expression] = None
-                if self.current()[0] == "LBRACE":
+                if kinds[self.index] == "LBRACE":
                     options_expr = self.parse_expression()
                 expr = TypeCoercion(expression=expr, target=target_type, options=options_expr)
                 continue
             if token_type == "DOT":
-                self.advance()
-                attr_token = self.current()
-                if attr_token[0] == "STAR":
-                    self.advance()
-                    name_token = self.expect("IDENT")
-                    attribute_name = f"*{name_token[1]}"  # type: ignore[index]
-                elif attr_token[0] == "AT":
-                    self.advance()
-                    name_token = self.expect("IDENT")
-                    attribute_name = f"@{name_token[1]}"  # type: ignore[index]
+                self.index += 1
+                attr_kind = kinds[self.index]
+                if attr_kind == "STAR":
+                    self.index += 1
+                    attribute_name = f"*{self.expect('IDENT')}"
+                elif attr_kind == "AT":
+                    self.index += 1
+                    attribute_name = f"@{self.expect('IDENT')}"
                 else:
-                    name_token = self.expect("IDENT")
-                    attribute_name = name_token[1]  # type: ignore[index]
+                    attribute_name = self.expect("IDENT") or ""
                 expr = PropertyAccess(value=expr, attribute=attribute_name)
             elif token_type == "SAFE_DOT":
-                self.advance()
-                attr_token = self.expect("IDENT")
-                expr = PropertyAccess(value=expr, attribute=attr_token[1], null_safe=True)  # type: ignore[index]
+                self.index += 1
+                attribute_name = self.expect("IDENT") or ""
+                expr = PropertyAccess(value=expr, attribute=attribute_name, null_safe=True)
             elif token_type == "LPAREN":
                 expr = self.parse_call(expr)
             elif token_type == "IDENT" and token_value not in RESERVED_INFIX_STOP:
                 operator_name = token_value or ""
-                self.advance()
+                self.index += 1
                 if operator_name == "to":
                     argument = self.parse_postfix_no_infix()
                 else:
                     argument = self.parse_postfix()
-                target_name = INFIX_SPECIAL.get(operator_name, operator_name)
-                expr = FunctionCall(
-                    function=Identifier(name=target_name),
-                    arguments=[expr, argument],
-                )
+                function = INFIX_IDENTIFIERS.get(operator_name)
+                if function is None:
+                    function = Identifier(name=operator_name)
+                expr = FunctionCall(function=function, arguments=[expr, argument])
             elif token_type == "LBRACKET":
-                self.advance()
+                self.index += 1
                 index_expr = self.parse_expression()
                 self.expect("RBRACKET")
                 expr = IndexAccess(value=expr, index=index_expr)
             elif token_type == "IDENT" and token_value == "match":
-                self.advance()
+                self.index += 1
                 expr = self.parse_match_expression(expr)
             else:
                 break
@@ -512,31 +562,29 @@ class Parser:
 
     def parse_postfix_no_infix(self) -> Expression:
         expr = self.parse_primary()
+        kinds = self.kinds
         while True:
-            token_type = self.current()[0]
+            token_type = kinds[self.index]
             if token_type == "DOT":
-                self.advance()
-                attr_token = self.current()
-                if attr_token[0] == "STAR":
-                    self.advance()
-                    name_token = self.expect("IDENT")
-                    attribute_name = f"*{name_token[1]}"  # type: ignore[index]
-                elif attr_token[0] == "AT":
-                    self.advance()
-                    name_token = self.expect("IDENT")
-                    attribute_name = f"@{name_token[1]}"  # type: ignore[index]
+                self.index += 1
+                attr_kind = kinds[self.index]
+                if attr_kind == "STAR":
+                    self.index += 1
+                    attribute_name = f"*{self.expect('IDENT')}"
+                elif attr_kind == "AT":
+                    self.index += 1
+                    attribute_name = f"@{self.expect('IDENT')}"
                 else:
-                    name_token = self.expect("IDENT")
-                    attribute_name = name_token[1]  # type: ignore[index]
+                    attribute_name = self.expect("IDENT") or ""
                 expr = PropertyAccess(value=expr, attribute=attribute_name)
             elif token_type == "SAFE_DOT":
-                self.advance()
-                attr_token = self.expect("IDENT")
-                expr = PropertyAccess(value=expr, attribute=attr_token[1], null_safe=True)  # type: ignore[index]
+                self.index += 1
+                attribute_name = self.expect("IDENT") or ""
+                expr = PropertyAccess(value=expr, attribute=attribute_name, null_safe=True)
             elif token_type == "LPAREN":
                 expr = self.parse_call(expr)
             elif token_type == "LBRACKET":
-                self.advance()
+                self.index += 1
                 index_expr = self.parse_expression()
                 self.expect("RBRACKET")
                 expr = IndexAccess(value=expr, index=index_expr)
@@ -545,15 +593,14 @@ class Parser:
         return expr
 
     def _parse_type_spec(self) -> TypeSpec:
-        ident = self.expect("IDENT")
-        name = ident[1] or ""
+        name = self.expect("IDENT") or ""
         generics: List[TypeSpec] = []
-        if self.current()[0] == "LT":
-            self.advance()
+        if self.current_kind() == "LT":
+            self.index += 1
             while True:
                 generics.append(self._parse_type_spec())
-                if self.current()[0] == "COMMA":
-                    self.advance()
+                if self.current_kind() == "COMMA":
+                    self.index += 1
                     continue
                 self.expect("GT")
                 break
@@ -561,39 +608,37 @@ class Parser:
 
     def parse_call(self, function_expr: Expression) -> Expression:
         self.expect("LPAREN")
-        args: List[Expression] = []
-        if not self.match("RPAREN"):
-            while True:
-                args.append(self.parse_expression())
-                if self.match("RPAREN"):
-                    break
-                self.expect("COMMA")
+        if self.match("RPAREN"):
+            return FunctionCall(function=function_expr, arguments=[])
+        args: List[Expression] = [self.parse_expression()]
+        while not self.match("RPAREN"):
+            self.expect("COMMA")
+            args.append(self.parse_expression())
         return FunctionCall(function=function_expr, arguments=args)
 
     def parse_match_expression(self, value_expr: Expression) -> Expression:
         self.expect("LBRACE")
         cases: List[MatchCase] = []
         while not self.match("RBRACE"):
-            token = self.current()
-            token_type = token[0]
-            token_value = token[1]
+            token_type = self.current_kind()
+            token_value = self.current_value()
             if token_type == "IDENT" and token_value == "case":
-                self.advance()
+                self.index += 1
                 pattern = self._parse_match_pattern()
                 self.expect("ARROW")
                 result_expr = self.parse_expression()
                 cases.append(MatchCase(pattern=pattern, expression=result_expr))
             elif token_type == "IDENT" and token_value == "else":
-                self.advance()
+                self.index += 1
                 self.expect("ARROW")
                 result_expr = self.parse_expression()
                 cases.append(MatchCase(pattern=None, expression=result_expr))
             else:
-                current = self.current()
+                line, column = self.position()
                 raise ParseError(
-                    f"Expected 'case' or 'else' in match expression at line {current[2]}, column {current[3]}",
-                    current[2],
-                    current[3],
+                    f"Expected 'case' or 'else' in match expression at line {line}, column {column}",
+                    line,
+                    column,
                 )
             if self.match("COMMA"):
                 continue
@@ -602,47 +647,66 @@ class Parser:
         return MatchExpression(value=value_expr, cases=cases)
 
     def _parse_match_pattern(self) -> MatchPattern:
-        token = self.current()
-        token_type = token[0]
-        token_value = token[1]
         binding: Optional[str] = None
         matcher: Optional[Expression] = None
         guard: Optional[Expression] = None
-        if token_type == "IDENT" and token_value == "var":
-            self.advance()
-            name_token = self.expect("IDENT")
-            binding = name_token[1] or ""  # type: ignore[index]
+        if self.current_kind() == "IDENT" and self.current_value() == "var":
+            self.index += 1
+            binding = self.expect("IDENT") or ""
         else:
             matcher = self.parse_expression()
 
-        if self.current()[0] == "IDENT" and self.current()[1] == "when":
-            self.advance()
+        if self.current_kind() == "IDENT" and self.current_value() == "when":
+            self.index += 1
             guard = self.parse_expression()
 
         return MatchPattern(binding=binding, matcher=matcher, guard=guard)
 
     def _maybe_parse_lambda_expression(self) -> Optional[Expression]:
+        # A lambda's parameter list must close right before "->": "(a, b) -> body"
+        # or, in the legacy form, "((a, b) -> body)".  Checking that shape first
+        # keeps ordinary parenthesised expressions off the exception-driven path.
         saved_index = self.index
-        try:
-            return self._parse_lambda_expression_simple()
-        except ParseError:
-            self.index = saved_index
+        kinds = self.kinds
+        closing = self._closing_paren(saved_index)
+        if closing >= 0 and kinds[closing + 1] == "ARROW":
             try:
-                return self._parse_lambda_expression_legacy()
+                return self._parse_lambda_expression_simple()
             except ParseError:
                 self.index = saved_index
-                return None
+        if kinds[saved_index + 1] == "LPAREN":
+            closing = self._closing_paren(saved_index + 1)
+            if closing >= 0 and kinds[closing + 1] == "ARROW":
+                try:
+                    return self._parse_lambda_expression_legacy()
+                except ParseError:
+                    self.index = saved_index
+        return None
+
+    def _closing_paren(self, index: int) -> int:
+        """Index of the RPAREN matching the LPAREN at ``index``, or -1 if unmatched."""
+        closing_parens = self._closing_parens
+        if closing_parens is None:
+            closing_parens = [-1] * len(self.kinds)
+            open_parens: List[int] = []
+            for position, kind in enumerate(self.kinds):
+                if kind == "LPAREN":
+                    open_parens.append(position)
+                elif kind == "RPAREN" and open_parens:
+                    closing_parens[open_parens.pop()] = position
+            self._closing_parens = closing_parens
+        return closing_parens[index]
 
     def _parse_lambda_expression_simple(self) -> Expression:
         self.expect("LPAREN")
         parameters: List[Parameter] = []
         if not self.match("RPAREN"):
             while True:
-                name_token = self.expect("IDENT")
+                name = self.expect("IDENT")
                 default_expr: Optional[Expression] = None
                 if self.match("EQUAL"):
                     default_expr = self.parse_expression()
-                parameters.append(Parameter(name=name_token[1] or "", default=default_expr))  # type: ignore[index]
+                parameters.append(Parameter(name=name or "", default=default_expr))
                 if self.match("COMMA"):
                     continue
                 self.expect("RPAREN")
@@ -665,11 +729,11 @@ class Parser:
         if self.match("RPAREN"):
             return parameters
         while True:
-            name_token = self.expect("IDENT")
+            name = self.expect("IDENT")
             default_expr: Optional[Expression] = None
             if self.match("EQUAL"):
                 default_expr = self.parse_expression()
-            parameters.append(Parameter(name=name_token[1] or "", default=default_expr))  # type: ignore[index]
+            parameters.append(Parameter(name=name or "", default=default_expr))
             if self.match("COMMA"):
                 continue
             self.expect("RPAREN")
@@ -677,46 +741,49 @@ class Parser:
         return parameters
 
     def parse_primary(self) -> Expression:
-        token = self.current()
-        token_type = token[0]
-        value = token[1]
+        index = self.index
+        token_type = self.kinds[index]
+        value = self.values[index]
         if token_type == "LBRACE":
             return self.parse_object()
         if token_type == "LBRACKET":
             return self.parse_list()
         if token_type == "STRING":
-            self.advance()
+            self.index += 1
             unescaped = _unescape_string(value or "")
             # Check for string interpolation
             if "$(" in unescaped:
                 return self._parse_interpolated_string(unescaped)
             return StringLiteral(value=unescaped)
         if token_type == "NUMBER":
-            self.advance()
+            self.index += 1
             return NumberLiteral(value=float(value))  # type: ignore[arg-type]
         if token_type == "BOOLEAN":
-            self.advance()
+            self.index += 1
             return BooleanLiteral(value=(value == "true"))
         if token_type == "NULL":
-            self.advance()
+            self.index += 1
             return NullLiteral()
         if token_type == "IDENT":
-            self.advance()
-            return Identifier(name=value or "", line=token[2], column=token[3])
+            self.index += 1
+            line, column = self.position(index)
+            return Identifier(name=value or "", line=line, column=column)
         if token_type == "DOLLAR":
-            self.advance()
+            self.index += 1
             placeholder_text = value or ""
-            return Placeholder(level=len(placeholder_text), line=token[2], column=token[3])
+            line, column = self.position(index)
+            return Placeholder(level=len(placeholder_text), line=line, column=column)
         if token_type == "LPAREN":
             lambda_expr = self._maybe_parse_lambda_expression()
             if lambda_expr is not None:
                 return lambda_expr
-            self.advance()
+            self.index += 1
             expr = self.parse_expression()
             self.expect("RPAREN")
             return expr
+        line, column = self.position(index)
         raise ParseError(
-            f"Unexpected token {token_type} at line {token[2]}, column {token[3]}"
+            f"Unexpected token {token_type} at line {line}, column {column}"
         )
 
     def parse_object(self) -> Expression:
@@ -724,21 +791,22 @@ class Parser:
         fields: List[Tuple[Expression, Expression]] = []
         if not self.match("RBRACE"):
             while True:
-                key_token = self.current()
-                if key_token[0] == "STRING":
-                    self.advance()
-                    unescaped = _unescape_string(key_token[1] or "")
+                index = self.index
+                key_kind = self.kinds[index]
+                if key_kind == "STRING":
+                    key_source = self.values[index]
+                    self.index = index + 1
+                    unescaped = _unescape_string(key_source or "")
                     if "$(" in unescaped:
                         key_expr = self._parse_interpolated_string(unescaped)
                     else:
                         key_expr = StringLiteral(value=unescaped)
-                elif key_token[0] == "LPAREN":
-                    self.advance()
+                elif key_kind == "LPAREN":
+                    self.index += 1
                     key_expr = self.parse_expression()
                     self.expect("RPAREN")
                 else:
-                    ident = self.expect("IDENT")
-                    key_expr = StringLiteral(value=ident[1] or "")
+                    key_expr = StringLiteral(value=self.expect("IDENT") or "")
                 self.expect("COLON")
                 value = self.parse_expression()
                 fields.append((key_expr, value))
@@ -808,8 +876,44 @@ class Parser:
         return InterpolatedString(parts=parts)
 
 
+_ESCAPE_SEQUENCE = re.compile(
+    r"\\(?:u([0-9a-fA-F]{4})|x([0-9a-fA-F]{2})|U([0-9a-fA-F]{8})|([0-7]{1,3})|([uxU])|(.))",
+    re.DOTALL,
+)
+
+_SIMPLE_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "a": "\a",
+    "\\": "\\",
+    "'": "'",
+    '"': '"',
+}
+
+
+def _replace_escape(match: "re.Match[str]") -> str:
+    hex_digits = match.group(1) or match.group(2) or match.group(3)
+    if hex_digits:
+        return chr(int(hex_digits, 16))
+    octal_digits = match.group(4)
+    if octal_digits:
+        return chr(int(octal_digits, 8))
+    if match.group(5):
+        raise ParseError(f"Invalid \\{match.group(5)} escape in string literal")
+    char = match.group(6)
+    # Unknown escapes are kept as written, backslash included.
+    return _SIMPLE_ESCAPES.get(char, "\\" + char)
+
+
 def _unescape_string(value: str) -> str:
-    return bytes(value[1:-1], "utf-8").decode("unicode_escape")
+    content = value[1:-1]
+    if "\\" not in content:
+        return content
+    return _ESCAPE_SEQUENCE.sub(_replace_escape, content)
 
 
 def parse_script(source: str) -> Script:
@@ -861,29 +965,21 @@ def _parse_header(header_source: str) -> Header:
             continue
         if not line:
             continue
-        if line.startswith("%dw"):
-            parts = line.split()
-            if len(parts) < 2:
-                raise ParseError(f"Invalid %dw directive at header line {idx}", idx, 1)
-            version = parts[1]
-            continue
-        if line.startswith("output"):
-            output = line[len("output") :].strip() or None
-            continue
-        if line.startswith("import "):
-            imports.append(ImportDirective(raw=line[len("import ") :].strip()))
-            continue
-        if line.startswith("type "):
-            continue
-        if line.startswith("var "):
-            declaration_source = line[len("var ") :].strip()
-            if "=" not in declaration_source:
+        # Directives written as ``keyword <rest>`` dispatch on the text before the
+        # first space; ``%dw`` and ``output`` keep their prefix matches below.
+        # A keyword with nothing after it is not a directive and falls through
+        # to the unsupported-directive error.
+        keyword, _, rest = line.partition(" ")
+        if not rest:
+            keyword = ""
+        if keyword == "var":
+            name_part, equals, expr_part = rest.partition("=")
+            if not equals:
                 raise ParseError(
                     f"Invalid var declaration (missing '=') at header line {idx}",
                     idx,
                     1,
                 )
-            name_part, expr_part = declaration_source.split("=", 1)
             name = name_part.strip()
             if not name:
                 raise ParseError(
@@ -894,9 +990,22 @@ def _parse_header(header_source: str) -> Header:
             expression = parse_expression_from_source(expr_part.strip())
             variables.append(VarDeclaration(name=name, expression=expression))
             continue
-        if line.startswith("fun "):
-            function = _parse_header_function(line[len("fun ") :].strip(), idx)
-            functions.append(function)
+        if keyword == "fun":
+            functions.append(_parse_header_function(rest.strip(), idx))
+            continue
+        if keyword == "import":
+            imports.append(ImportDirective(raw=rest.strip()))
+            continue
+        if keyword == "type":
+            continue
+        if line.startswith("%dw"):
+            parts = line.split()
+            if len(parts) < 2:
+                raise ParseError(f"Invalid %dw directive at header line {idx}", idx, 1)
+            version = parts[1]
+            continue
+        if line.startswith("output"):
+            output = line[len("output") :].strip() or None
             continue
         raise ParseError(
             f"Unsupported header directive '{line}' at header line {idx}",
@@ -1013,8 +1122,8 @@ def _parse_type_spec_string(source: str) -> TypeSpec:
 
 class _TypeSpecParser:
     def __init__(self, source: str):
-        self.source = source
-        self.index = 0
+        self.source: str = source
+        self.index: int = 0
 
     def at_end(self) -> bool:
         return self.index >= len(self.source)
@@ -1073,11 +1182,59 @@ INFIX_SPECIAL = {
     "or": "_binary_or",
 }
 
-RESERVED_INFIX_STOP = {
+COMPARISON_OPERATORS = {
+    "EQ": "_binary_eq",
+    "NEQ": "_binary_neq",
+    "GT": "_binary_gt",
+    "LT": "_binary_lt",
+    "GTE": "_binary_gte",
+    "LTE": "_binary_lte",
+}
+
+ADDITIVE_OPERATORS = {
+    "PLUS": "_binary_plus",
+    "CONCAT": "_binary_concat",
+    "DIFF": "_binary_diff",
+}
+
+MULTIPLICATIVE_OPERATORS = {
+    "STAR": "_binary_times",
+    "DIV": "_binary_divide",
+}
+
+BINARY_OPERATORS = {**COMPARISON_OPERATORS, **ADDITIVE_OPERATORS, **MULTIPLICATIVE_OPERATORS}
+
+# Binding strength of each binary operator token; higher binds tighter.  Kinds
+# missing here end a binary expression.
+BINARY_PRECEDENCE = {
+    "DEFAULT": 1,
+    **{kind: 2 for kind in COMPARISON_OPERATORS},
+    **{kind: 3 for kind in ADDITIVE_OPERATORS},
+    **{kind: 4 for kind in MULTIPLICATIVE_OPERATORS},
+}
+
+# Position-less operator references are never mutated, so every call site shares one node.
+OPERATOR_IDENTIFIERS = {
+    name: Identifier(name=name)
+    for table in (COMPARISON_OPERATORS, ADDITIVE_OPERATORS, MULTIPLICATIVE_OPERATORS, INFIX_SPECIAL)
+    for name in table.values()
+}
+
+# Token kinds that can continue a postfix chain; anything else ends it straight away.
+POSTFIX_TOKEN_KINDS = frozenset({"IDENT", "DOT", "SAFE_DOT", "LPAREN", "LBRACKET"})
+
+# Infix word in source -> the node referencing the function it calls.  Words
+# without an entry call the function of the same name.
+INFIX_IDENTIFIERS = {
+    **OPERATOR_IDENTIFIERS,
+    **{word: OPERATOR_IDENTIFIERS[name] for word, name in INFIX_SPECIAL.items()},
+}
+
+RESERVED_INFIX_STOP = frozenset({
     "else",
     "when",
     "default",
     "match",
     "case",
     "var",
-}
+})
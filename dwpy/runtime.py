@@ -5,9 +5,9 @@ import re
 import inspect
 import copy
 from datetime import date, datetime, time, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Mapping, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Mapping, Set, Tuple, Union
 
 from . import builtins, parser
 from .formats import FormatRegistry, FormatError, XMLNodeList, XMLNodeDict
@@ -22,6 +22,40 @@ Missing = object()
 MODULE_BASE_PATH = Path(__file__).resolve().parent / "modules"
 LOGGER = logging.getLogger(__name__)
 
+# Integers this small add exactly in floating point, so ``+`` can skip the
+# float round trip it otherwise uses for numbers.
+_EXACT_INT_BOUND = 2**52
+
+# Types whose instances compare equal to a literal only if they hash like it.
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+# Builtins that only iterate their first argument, so ``a to b`` there can stay a range.
+_RANGE_CONSUMERS = frozenset(
+    {"_infix_map", "_infix_filter", "_infix_flatMap", "_infix_reduce", "_infix_distinctBy"}
+)
+
+
+# Operators whose result depends only on their operands, so calls to them can be
+# hoisted out of lambda bodies when the operands can.
+PURE_OPERATORS = frozenset(
+    {
+        "_binary_plus",
+        "_binary_times",
+        "_binary_divide",
+        "_binary_concat",
+        "_binary_diff",
+        "_binary_eq",
+        "_binary_neq",
+        "_binary_gt",
+        "_binary_lt",
+        "_binary_gte",
+        "_binary_lte",
+        "_binary_and",
+        "_binary_or",
+    }
+)
+
 
 class DataWeaveEvaluationError(RuntimeError):
     def __init__(
@@ -39,12 +73,53 @@ class DataWeaveEvaluationError(RuntimeError):
         self.original = original
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationContext:
+    """Scope an expression is evaluated in.
+
+    ``variables`` is not mutated once evaluation in it has started, so closures
+    created in the scope capture the dict itself rather than a copy.
+    """
+
     payload: Any
     variables: Dict[str, Any]
     header: Optional[parser.Header] = None
     line_offset: int = 0
+    # Values of repeated access chains already evaluated in this context.
+    memo: Optional[Dict[object, Any]] = None
+    # Loop-invariant values shared by every call of the lambda being evaluated.
+    invariants: Optional[Dict[object, Any]] = None
+
+
+# A compiled expression: evaluates one AST node against a context.
+Evaluator = Callable[[EvaluationContext], Any]
+# A lambda body compiled against its first two arguments alone; see _compile_kernel.
+Kernel = Callable[[Any, Any], Any]
+
+
+@dataclass(slots=True)
+class CompiledScript:
+    """A parsed script with its header and body lowered to evaluators."""
+
+    script: parser.Script
+    functions: List[Evaluator]
+    declarations: List[Evaluator]
+    body: Evaluator
+    body_line_offset: int
+    # Reuse slots of the lambdas compiled in the script; cleared after each run.
+    lambda_slots: List[List[Any]]
+
+
+@dataclass(slots=True)
+class CompileState:
+    """What one compilation knows about the scope it is lowering; see _compile_scope."""
+
+    # Memo tokens for property/index accesses repeated in the scope.
+    shared_subexpressions: Dict[Tuple[Any, ...], object] = field(default_factory=dict)
+    # Hoisting tokens by node id for a lambda body.
+    loop_invariants: Dict[int, object] = field(default_factory=dict)
+    # Reuse slots of the script being compiled, or None outside one; see _compile_lambda.
+    lambda_slots: Optional[List[List[Any]]] = None
 
 
 @dataclass
@@ -62,41 +137,57 @@ class LambdaCallable:
     closure_variables: Dict[str, Any]
     payload: Any
     header: Optional[parser.Header]
+    evaluate_body: Evaluator
+    # Per-parameter names and compiled defaults, settled when the lambda is compiled.
+    parameter_names: Tuple[str, ...]
+    evaluate_defaults: Tuple[Optional[Evaluator], ...]
+    invariants: Dict[object, Any] = field(default_factory=dict)
+    kernel: Optional[Kernel] = None
 
     def __call__(self, *args: Any) -> Any:
+        names = self.parameter_names
+        arity = len(names)
+        if self.kernel is not None and len(args) == arity:
+            return self.kernel(args[0], args[1] if arity == 2 else None)
         local_vars: Dict[str, Any] = dict(self.closure_variables)
-        provided_args = list(args)
-        if len(provided_args) > len(self.parameters):
-            raise TypeError("Too many arguments supplied to lambda expression")
-        for index, parameter in enumerate(self.parameters):
-            if index < len(provided_args):
-                local_vars[parameter.name] = provided_args[index]
-            else:
-                if parameter.default is not None:
-                    default_ctx = EvaluationContext(
-                        payload=self.payload,
-                        variables=dict(local_vars),
-                        header=self.header,
-                    )
-                    local_vars[parameter.name] = self.runtime._evaluate(
-                        parameter.default, default_ctx
-                    )
-                else:
-                    raise TypeError(f"Missing argument '{parameter.name}' for lambda")
-        if self.parameters:
-            first_param = self.parameters[0].name
-            if first_param in local_vars:
-                local_vars.setdefault("$", local_vars[first_param])
-        if len(self.parameters) > 1:
-            second_param = self.parameters[1].name
-            if second_param in local_vars:
-                local_vars.setdefault("$$", local_vars[second_param])
+        if len(args) != arity:
+            self._bind_partial(local_vars, args)
+        elif arity == 1:
+            local_vars[names[0]] = args[0]
+        elif arity == 2:
+            local_vars[names[0]] = args[0]
+            local_vars[names[1]] = args[1]
+        else:
+            local_vars.update(zip(names, args))
+        if arity:
+            if "$" not in local_vars:
+                local_vars["$"] = local_vars[names[0]]
+            if arity > 1 and "$$" not in local_vars:
+                local_vars["$$"] = local_vars[names[1]]
         body_ctx = EvaluationContext(
             payload=self.payload,
             variables=local_vars,
             header=self.header,
+            invariants=self.invariants,
         )
-        return self.runtime._evaluate(self.body, body_ctx)
+        return self.evaluate_body(body_ctx)
+
+    def _bind_partial(self, local_vars: Dict[str, Any], args: Tuple[Any, ...]) -> None:
+        if len(args) > len(self.parameter_names):
+            raise TypeError("Too many arguments supplied to lambda expression")
+        for index, name in enumerate(self.parameter_names):
+            if index < len(args):
+                local_vars[name] = args[index]
+                continue
+            evaluate_default = self.evaluate_defaults[index]
+            if evaluate_default is None:
+                raise TypeError(f"Missing argument '{name}' for lambda")
+            default_ctx = EvaluationContext(
+                payload=self.payload,
+                variables=dict(local_vars),
+                header=self.header,
+            )
+            local_vars[name] = evaluate_default(default_ctx)
 
 
 @dataclass
@@ -106,6 +197,7 @@ class DefinedFunction:
     body: parser.Expression
     context: EvaluationContext
     return_type: Optional[parser.TypeSpec]
+    evaluate_body: Evaluator
 
     def __call__(self, *args: Any) -> Any:
         local_vars: Dict[str, Any] = dict(self.context.variables)
@@ -132,7 +224,7 @@ class DefinedFunction:
             variables=local_vars,
             header=self.context.header,
         )
-        result = self.runtime._evaluate(self.body, body_ctx)
+        result = self.evaluate_body(body_ctx)
         if self.return_type is not None:
             result = self.runtime._coerce_value(result, self.return_type, None, body_ctx)
         return result
@@ -170,6 +262,9 @@ class ImplicitLambdaCallable:
     payload: Any
     header: Optional[parser.Header]
     placeholders: Set[int]
+    evaluate_body: Evaluator
+    invariants: Dict[object, Any] = field(default_factory=dict)
+    kernel: Optional[Kernel] = None
 
     def __post_init__(self) -> None:
         if 2 in self.placeholders:
@@ -181,20 +276,25 @@ class ImplicitLambdaCallable:
             self.parameters = [parser.Parameter(name="$")]
 
     def __call__(self, *args: Any) -> Any:
-        local_vars: Dict[str, Any] = dict(self.closure_variables)
         value = args[0] if args else None
         index = args[1] if len(args) > 1 else None
+        if self.kernel is not None:
+            return self.kernel(value, index)
+        local_vars: Dict[str, Any] = dict(self.closure_variables)
         local_vars["$"] = value
         local_vars["$$"] = index
         body_ctx = EvaluationContext(
             payload=self.payload,
             variables=local_vars,
             header=self.header,
+            invariants=self.invariants,
         )
-        return self.runtime._evaluate(self.body, body_ctx)
+        return self.evaluate_body(body_ctx)
 
 
 class DataWeaveRuntime:
+    # Compiled scripts kept per runtime, keyed by their source text.
+    _SCRIPT_CACHE_SIZE = 256
     _IMPLICIT_LAMBDA_ARGUMENTS: Dict[str, Tuple[int, ...]] = {
         "_infix_map": (1,),
         "_infix_filter": (1,),
@@ -210,6 +310,34 @@ class DataWeaveRuntime:
 
     def __init__(self, *, enable_module_imports: bool = True) -> None:
         self._enable_module_imports = enable_module_imports
+        self._script_cache: Dict[str, CompiledScript] = {}
+        # Compile handlers keyed by exact node type; see _compile_node.
+        self._compilers: Dict[type, Callable[[Any, CompileState], Evaluator]] = {
+            parser.ObjectLiteral: self._compile_object,
+            parser.ListLiteral: self._compile_list,
+            parser.StringLiteral: self._compile_string_template,
+            parser.Placeholder: self._compile_placeholder,
+            parser.InterpolatedString: self._compile_interpolated_string,
+            parser.Identifier: self._compile_identifier,
+            parser.PropertyAccess: self._compile_shared_access,
+            parser.IndexAccess: self._compile_shared_access,
+            parser.FunctionCall: self._compile_function_call,
+            parser.DefaultOp: self._compile_default,
+            parser.LambdaExpression: self._compile_lambda,
+            parser.IfExpression: self._compile_if,
+            parser.MatchExpression: self._compile_match,
+            parser.TypeCoercion: self._compile_coercion,
+        }
+        # Conversions for scalar ``as`` targets, keyed by lower-cased type name.
+        self._scalar_coercions: Dict[str, Callable[[Any], Any]] = {
+            "number": self._coerce_number,
+            "string": self._coerce_string,
+            "boolean": self._coerce_boolean,
+            "bool": self._coerce_boolean,
+            "binary": self._coerce_binary,
+            "date": self._coerce_string,
+            "datetime": self._coerce_string,
+        }
         self._builtins: Dict[str, Callable[..., Any]] = dict(builtins.CORE_FUNCTIONS)
         self._builtins.update(
             {
@@ -249,16 +377,31 @@ class DataWeaveRuntime:
         variables = {
             name: self._normalise_input_value(value) for name, value in provided_vars.items()
         }
+        compiled = self._compile_script(script_source)
         try:
-            script = parser.parse_script(script_source)
-        except parser.ParseError as err:
-            formatted = self._format_error_message(
-                script_source,
-                str(err),
-                err.line,
-                err.column,
-            )
-            raise parser.ParseError(formatted, err.line, err.column) from err
+            result = self._run_script(compiled, script_source, payload, variables)
+        finally:
+            # Lambda reuse slots would otherwise keep this call's payload alive
+            # for as long as the compiled script stays cached.
+            for slot in compiled.lambda_slots:
+                slot[0] = None
+        script = compiled.script
+        if not render_output:
+            return self._collapse_xml_nodes(result)
+        directive = self._parse_output_directive(script.header.output)
+        if directive is None or directive.format_id == "python":
+            return self._collapse_xml_nodes(result)
+        return self._render_output(result, directive)
+
+    def _run_script(
+        self,
+        compiled: CompiledScript,
+        script_source: str,
+        payload: Any,
+        variables: Dict[str, Any],
+    ) -> Any:
+        """Evaluate the header and body of ``compiled`` for one payload."""
+        script = compiled.script
         header_context = EvaluationContext(
             payload=payload,
             variables=variables,
@@ -268,13 +411,14 @@ class DataWeaveRuntime:
         if self._enable_module_imports:
             imported = self._resolve_imports(script.header.imports)
             header_context.variables.update(imported)
-        for function_decl in script.header.functions:
+        for function_decl, evaluate_body in zip(script.header.functions, compiled.functions):
             defined_function = DefinedFunction(
                 runtime=self,
                 parameters=function_decl.parameters,
                 body=function_decl.body,
                 context=header_context,
                 return_type=function_decl.return_type,
+                evaluate_body=evaluate_body,
             )
             existing_function = header_context.variables.get(function_decl.name)
             if isinstance(existing_function, OverloadedFunction):
@@ -286,18 +430,23 @@ class DataWeaveRuntime:
                 )
             else:
                 header_context.variables[function_decl.name] = defined_function
-        for declaration in script.header.variables:
-            value = self._evaluate(declaration.expression, header_context)
-            header_context.variables[declaration.name] = value
-        body_line_offset = self._compute_body_line_offset(script_source)
+        for declaration, evaluate_declaration in zip(script.header.variables, compiled.declarations):
+            # Closures share the scope they are created in, so each declaration is
+            # evaluated against a snapshot that later declarations leave untouched.
+            declaration_context = EvaluationContext(
+                payload=payload,
+                variables=dict(header_context.variables),
+                header=script.header,
+            )
+            header_context.variables[declaration.name] = evaluate_declaration(declaration_context)
         body_context = EvaluationContext(
             payload=payload,
             variables=header_context.variables,
             header=script.header,
-            line_offset=body_line_offset,
+            line_offset=compiled.body_line_offset,
         )
         try:
-            result = self._evaluate(script.body, body_context)
+            return compiled.body(body_context)
         except DataWeaveEvaluationError as err:
             formatted = self._format_error_message(
                 script_source,
@@ -313,12 +462,43 @@ class DataWeaveRuntime:
                 err.length,
                 err.original or err,
             ) from (err.original or err)
-        if not render_output:
-            return self._collapse_xml_nodes(result)
-        directive = self._parse_output_directive(script.header.output)
-        if directive is None or directive.format_id == "python":
-            return self._collapse_xml_nodes(result)
-        return self._render_output(result, directive)
+
+    def _compile_script(self, script_source: str) -> CompiledScript:
+        """Parse and compile ``script_source``, reusing earlier work for the same source."""
+        compiled = self._script_cache.get(script_source)
+        if compiled is not None:
+            return compiled
+        try:
+            script = parser.parse_script(script_source)
+        except parser.ParseError as err:
+            formatted = self._format_error_message(
+                script_source,
+                str(err),
+                err.line,
+                err.column,
+            )
+            raise parser.ParseError(formatted, err.line, err.column) from err
+        lambda_slots: List[List[Any]] = []
+        state = CompileState(lambda_slots=lambda_slots)
+        compiled = CompiledScript(
+            script=script,
+            functions=[
+                self._compile_scope(function_decl.body, state)
+                for function_decl in script.header.functions
+            ],
+            declarations=[
+                self._compile_scope(declaration.expression, state)
+                for declaration in script.header.variables
+            ],
+            body=self._compile_scope(script.body, state),
+            body_line_offset=self._compute_body_line_offset(script_source),
+            lambda_slots=lambda_slots,
+        )
+        if len(self._script_cache) >= self._SCRIPT_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order.
+            del self._script_cache[next(iter(self._script_cache))]
+        self._script_cache[script_source] = compiled
+        return compiled
 
     def _normalise_input_value(self, value: Any) -> Any:
         if PANDAS_AVAILABLE:
@@ -484,35 +664,454 @@ class DataWeaveRuntime:
         return True
 
     def _evaluate(self, expr: parser.Expression, ctx: EvaluationContext) -> Any:
-        if isinstance(expr, parser.ObjectLiteral):
+        return self._compile_scope(expr, CompileState())(ctx)
+
+    def _compile(self, expr: parser.Expression, state: CompileState) -> Evaluator:
+        """Lower ``expr`` once into a closure that evaluates it against a context.
+
+        Dispatch on node type, literal conversion and the shape of each node are
+        settled here, so evaluating the result only runs the work that depends on
+        the context.
+        """
+        token = state.loop_invariants.get(id(expr))
+        if token is not None:
+            return self._hoist(token, self._compile_node(expr, state))
+        return self._compile_node(expr, state)
+
+    def _compile_node(self, expr: parser.Expression, state: CompileState) -> Evaluator:
+        constant = self._literal_value(expr)
+        if constant is not Missing:
+            return lambda ctx: constant
+        compile_expression = self._compilers.get(type(expr))
+        if compile_expression is None:
+            raise TypeError(f"Unsupported expression: {expr!r}")
+        return compile_expression(expr, state)
+
+    def _compile_object(self, expr: parser.ObjectLiteral, state: CompileState) -> Evaluator:
+        to_string = self._to_string
+        constant_fields = [
+            (self._literal_value(key_expr), self._literal_value(value_expr))
+            for key_expr, value_expr in expr.fields
+        ]
+        if all(key is not Missing and value is not Missing for key, value in constant_fields):
+            # Built once; each evaluation hands out a shallow copy of scalars.
+            constant_obj = {
+                key if isinstance(key, str) else to_string(key): value
+                for key, value in constant_fields
+            }
+            return lambda ctx: dict(constant_obj)
+        fields = [
+            (self._compile(key_expr, state), self._compile(value_expr, state))
+            for key_expr, value_expr in expr.fields
+        ]
+
+        def evaluate_object(ctx: EvaluationContext) -> Any:
             result_obj: Dict[str, Any] = {}
-            for key_expr, value_expr in expr.fields:
-                key_value = self._evaluate(key_expr, ctx)
+            for key_fn, value_fn in fields:
+                key_value = key_fn(ctx)
                 if isinstance(key_value, str):
                     key_str = key_value
                 else:
-                    key_str = self._to_string(key_value)
-                result_obj[key_str] = self._evaluate(value_expr, ctx)
+                    key_str = to_string(key_value)
+                result_obj[key_str] = value_fn(ctx)
             return result_obj
-        if isinstance(expr, parser.ListLiteral):
-            return [self._evaluate(item, ctx) for item in expr.elements]
-        if isinstance(expr, parser.StringLiteral):
-            return self._evaluate_string_literal(expr.value, ctx)
-        if isinstance(expr, parser.Placeholder):
-            placeholder_name = "$" if expr.level == 1 else "$$"
+
+        return evaluate_object
+
+    def _compile_list(self, expr: parser.ListLiteral, state: CompileState) -> Evaluator:
+        constant_items = [self._literal_value(item) for item in expr.elements]
+        if all(item is not Missing for item in constant_items):
+            return lambda ctx: list(constant_items)
+        elements = [self._compile(item, state) for item in expr.elements]
+        return lambda ctx: [element_fn(ctx) for element_fn in elements]
+
+    def _compile_string_template(
+        self, expr: parser.StringLiteral, state: CompileState
+    ) -> Evaluator:
+        # Only templates with a ``$(`` interpolation get here.
+        template = expr.value
+        return lambda ctx: self._evaluate_string_literal(template, ctx)
+
+    def _compile_placeholder(self, expr: parser.Placeholder, state: CompileState) -> Evaluator:
+        placeholder_name = "$" if expr.level == 1 else "$$"
+        placeholder_line = expr.line or None
+        placeholder_column = expr.column or None
+
+        def evaluate_placeholder(ctx: EvaluationContext) -> Any:
             if placeholder_name in ctx.variables:
                 return ctx.variables[placeholder_name]
             raise DataWeaveEvaluationError(
                 f"Placeholder '{placeholder_name}' is not defined in this context",
-                line=expr.line or None,
-                column=expr.column or None,
+                line=placeholder_line,
+                column=placeholder_column,
+            )
+
+        return evaluate_placeholder
+
+    def _compile_interpolated_string(
+        self, expr: parser.InterpolatedString, state: CompileState
+    ) -> Evaluator:
+        parts = [self._compile(part, state) for part in expr.parts]
+        to_string = self._to_string
+        return lambda ctx: "".join([to_string(part_fn(ctx)) for part_fn in parts])
+
+    def _compile_shared_access(
+        self, expr: Union[parser.PropertyAccess, parser.IndexAccess], state: CompileState
+    ) -> Evaluator:
+        evaluate_access = self._compile_access(expr, state)
+        token = state.shared_subexpressions.get(self._access_key(expr))
+        if token is not None:
+            return self._memoize(token, evaluate_access)
+        return evaluate_access
+
+    def _compile_default(self, expr: parser.DefaultOp, state: CompileState) -> Evaluator:
+        left_fn = self._compile(expr.left, state)
+        right_fn = self._compile(expr.right, state)
+
+        def evaluate_default(ctx: EvaluationContext) -> Any:
+            left_value = left_fn(ctx)
+            if left_value is None:
+                return right_fn(ctx)
+            return left_value
+
+        return evaluate_default
+
+    def _compile_lambda(self, expr: parser.LambdaExpression, state: CompileState) -> Evaluator:
+        parameters = expr.parameters
+        body = expr.body
+        parameter_names = tuple(parameter.name for parameter in parameters)
+        default_fns = tuple(
+            self._compile_scope(parameter.default, state) if parameter.default is not None else None
+            for parameter in parameters
+        )
+        body_fn = self._compile_scope(body, state, list(parameter_names))
+        kernel = None
+        if len(parameter_names) in (1, 2) and not any(
+            name in self._builtins or name in ("payload", "vars") for name in parameter_names
+        ):
+            positions = {name: index for index, name in enumerate(parameter_names)}
+            kernel = self._compile_kernel(body, positions, placeholders=False)
+
+        def instantiate(ctx: EvaluationContext) -> LambdaCallable:
+            return LambdaCallable(
+                runtime=self,
+                parameters=parameters,
+                body=body,
+                closure_variables=ctx.variables,
+                payload=ctx.payload,
+                header=ctx.header,
+                evaluate_body=body_fn,
+                parameter_names=parameter_names,
+                evaluate_defaults=default_fns,
+                kernel=kernel,
             )
-        if isinstance(expr, parser.InterpolatedString):
-            result_parts = []
-            for part in expr.parts:
-                value = self._evaluate(part, ctx)
-                result_parts.append(self._to_string(value))
-            return "".join(result_parts)
+
+        free_names = self._free_names(expr)
+        lambda_slots = state.lambda_slots
+        if free_names is None or lambda_slots is None:
+            return instantiate
+        # A lambda created again in a loop reuses the previous instance, and the
+        # values it hoisted, while every name it can see is bound to the same object.
+        # The slot belongs to the compiled script, which empties it after each run.
+        last: List[Any] = [None]
+        lambda_slots.append(last)
+
+        def evaluate_lambda(ctx: EvaluationContext) -> LambdaCallable:
+            variables = ctx.variables
+            captured = tuple([variables.get(name, Missing) for name in free_names])
+            entry = last[0]
+            if (
+                entry is not None
+                and entry[0] is ctx.payload
+                and entry[1] is ctx.header
+                and all(old is new for old, new in zip(entry[2], captured))
+            ):
+                return entry[3]
+            instance = instantiate(ctx)
+            last[0] = (ctx.payload, ctx.header, captured, instance)
+            return instance
+
+        return evaluate_lambda
+
+    def _free_names(self, expr: parser.LambdaExpression) -> Optional[Tuple[str, ...]]:
+        """Names a lambda can read from its closure, or None if it may read any of them.
+
+        ``vars`` and ``$(...)`` string templates look names up at run time, so
+        lambdas using them have no fixed set.
+        """
+        names = {"$", "$$"}
+
+        def visit(node: parser.Expression) -> bool:
+            if isinstance(node, parser.Identifier):
+                names.add(node.name)
+                return node.name != "vars"
+            if isinstance(node, parser.StringLiteral):
+                return self._literal_value(node) is not Missing
+            if isinstance(node, parser.LambdaExpression):
+                children = [node.body]
+                children.extend(
+                    parameter.default
+                    for parameter in node.parameters
+                    if parameter.default is not None
+                )
+            else:
+                children = self._child_expressions(node)
+            return all(visit(child) for child in children)
+
+        if not visit(expr):
+            return None
+        return tuple(sorted(names))
+
+    def _compile_if(self, expr: parser.IfExpression, state: CompileState) -> Evaluator:
+        condition_fn = self._compile(expr.condition, state)
+        when_true_fn = self._compile(expr.when_true, state)
+        when_false_fn = self._compile(expr.when_false, state)
+        is_truthy = self._is_truthy
+
+        def evaluate_if(ctx: EvaluationContext) -> Any:
+            if is_truthy(condition_fn(ctx)):
+                return when_true_fn(ctx)
+            return when_false_fn(ctx)
+
+        return evaluate_if
+
+    def _compile_coercion(self, expr: parser.TypeCoercion, state: CompileState) -> Evaluator:
+        value_fn = self._compile(expr.expression, state)
+        options_fn = self._compile(expr.options, state) if expr.options is not None else None
+        coerce = self._coercer(expr.target)
+
+        def evaluate_coercion(ctx: EvaluationContext) -> Any:
+            value = value_fn(ctx)
+            options = options_fn(ctx) if options_fn is not None else None
+            return coerce(value, options, ctx)
+
+        return evaluate_coercion
+
+    def _compile_access(
+        self, expr: Union[parser.PropertyAccess, parser.IndexAccess], state: CompileState
+    ) -> Evaluator:
+        if isinstance(expr, parser.PropertyAccess):
+            attribute = expr.attribute
+            resolve_property = self._property_resolver(attribute)
+            if not expr.null_safe:
+                fused = self._compile_identifier_property(expr.value, attribute)
+                if fused is not None:
+                    return fused
+            base_fn = self._compile(expr.value, state)
+            if not expr.null_safe:
+                return lambda ctx: resolve_property(base_fn(ctx))
+
+            def evaluate_null_safe_property(ctx: EvaluationContext) -> Any:
+                base = base_fn(ctx)
+                try:
+                    return resolve_property(base)
+                except TypeError:
+                    return None
+
+            return evaluate_null_safe_property
+        base_fn = self._compile(expr.value, state)
+        index_fn = self._compile(expr.index, state)
+        resolve_index = self._resolve_index
+        return lambda ctx: resolve_index(base_fn(ctx), index_fn(ctx))
+
+    def _compile_scope(
+        self,
+        expr: parser.Expression,
+        state: CompileState,
+        parameters: Optional[List[str]] = None,
+    ) -> Evaluator:
+        """Compile an expression that is evaluated in contexts of its own, such as a lambda body.
+
+        ``parameters`` names the arguments of a lambda body; subexpressions that do
+        not depend on them are computed once per lambda instance.  The scope gets a
+        state of its own and shares only the lambda slots of ``state``.
+        """
+        scope = CompileState(
+            shared_subexpressions=self._find_shared_subexpressions(expr),
+            loop_invariants=(
+                self._find_loop_invariants(expr, parameters) if parameters is not None else {}
+            ),
+            lambda_slots=state.lambda_slots,
+        )
+        return self._compile(expr, scope)
+
+    def _find_shared_subexpressions(self, expr: parser.Expression) -> Dict[Tuple[Any, ...], object]:
+        """Token for each property/index access that occurs more than once in ``expr``'s scope.
+
+        Nested lambda bodies are separate scopes and are not searched.
+        """
+        counts: Dict[Tuple[Any, ...], int] = {}
+
+        def visit(node: parser.Expression) -> None:
+            if isinstance(node, parser.LambdaExpression):
+                return
+            if isinstance(node, (parser.PropertyAccess, parser.IndexAccess)):
+                key = self._access_key(node)
+                if key is not None:
+                    counts[key] = counts.get(key, 0) + 1
+            for child in self._child_expressions(node):
+                visit(child)
+
+        visit(expr)
+        return {key: object() for key, count in counts.items() if count > 1}
+
+    def _find_loop_invariants(
+        self, body: parser.Expression, parameters: List[str]
+    ) -> Dict[int, object]:
+        """Token for each maximal subexpression of a lambda body that ignores its arguments.
+
+        Only side-effect-free access chains and operator calls qualify.  Names bound
+        by ``match`` cases, ``vars`` and the placeholders count as arguments.
+        """
+        variant_names = {"$", "$$", "vars", *parameters}
+
+        def collect_bindings(node: parser.Expression) -> None:
+            if isinstance(node, parser.LambdaExpression):
+                return
+            if isinstance(node, parser.MatchExpression):
+                for case in node.cases:
+                    if case.pattern is not None and case.pattern.binding:
+                        variant_names.add(case.pattern.binding)
+            for child in self._child_expressions(node):
+                collect_bindings(child)
+
+        collect_bindings(body)
+        invariants: Dict[int, object] = {}
+        hoistable = (parser.PropertyAccess, parser.IndexAccess, parser.FunctionCall)
+
+        def visit(node: parser.Expression) -> bool:
+            if isinstance(node, parser.LambdaExpression):
+                return False
+            if isinstance(node, parser.Identifier):
+                return node.name not in variant_names
+            if self._literal_value(node) is not Missing:
+                return True
+            children = self._child_expressions(node)
+            children_invariant = [visit(child) for child in children]
+            if isinstance(node, parser.PropertyAccess):
+                invariant = children_invariant[0]
+            elif isinstance(node, parser.IndexAccess):
+                invariant = all(children_invariant)
+            elif isinstance(node, parser.FunctionCall):
+                function = node.function
+                invariant = (
+                    isinstance(function, parser.Identifier)
+                    and function.name in PURE_OPERATORS
+                    and all(children_invariant[1:])
+                )
+            else:
+                invariant = False
+            if not invariant:
+                for child, child_invariant in zip(children, children_invariant):
+                    if child_invariant and isinstance(child, hoistable):
+                        invariants[id(child)] = object()
+            return invariant
+
+        if visit(body) and isinstance(body, hoistable):
+            invariants[id(body)] = object()
+        return invariants
+
+    @staticmethod
+    def _hoist(token: object, evaluate: Evaluator) -> Evaluator:
+        """Evaluate once per lambda instance, on first use, and reuse it on later calls."""
+
+        def evaluate_invariant(ctx: EvaluationContext) -> Any:
+            invariants = ctx.invariants
+            if invariants is None:
+                return evaluate(ctx)
+            if token in invariants:
+                return invariants[token]
+            value = evaluate(ctx)
+            invariants[token] = value
+            return value
+
+        return evaluate_invariant
+
+    @staticmethod
+    def _child_expressions(node: parser.Expression) -> List[parser.Expression]:
+        if isinstance(node, parser.ObjectLiteral):
+            return [child for field in node.fields for child in field]
+        if isinstance(node, parser.ListLiteral):
+            return list(node.elements)
+        if isinstance(node, parser.InterpolatedString):
+            return list(node.parts)
+        if isinstance(node, parser.PropertyAccess):
+            return [node.value]
+        if isinstance(node, parser.IndexAccess):
+            return [node.value, node.index]
+        if isinstance(node, parser.FunctionCall):
+            return [node.function, *node.arguments]
+        if isinstance(node, parser.DefaultOp):
+            return [node.left, node.right]
+        if isinstance(node, parser.IfExpression):
+            return [node.condition, node.when_true, node.when_false]
+        if isinstance(node, parser.MatchExpression):
+            children = [node.value]
+            for case in node.cases:
+                pattern = case.pattern
+                if pattern is not None:
+                    if pattern.matcher is not None:
+                        children.append(pattern.matcher)
+                    if pattern.guard is not None:
+                        children.append(pattern.guard)
+                children.append(case.expression)
+            return children
+        if isinstance(node, parser.TypeCoercion):
+            if node.options is not None:
+                return [node.expression, node.options]
+            return [node.expression]
+        return []
+
+    @classmethod
+    def _access_key(cls, expr: parser.Expression) -> Optional[Tuple[Any, ...]]:
+        """Structural key of a side-effect-free access chain, ignoring source positions."""
+        if isinstance(expr, parser.Identifier):
+            return ("name", expr.name)
+        if isinstance(expr, parser.Placeholder):
+            return ("placeholder", expr.level)
+        if isinstance(expr, parser.PropertyAccess):
+            base_key = cls._access_key(expr.value)
+            if base_key is None:
+                return None
+            return ("property", base_key, expr.attribute, expr.null_safe)
+        if isinstance(expr, parser.IndexAccess):
+            base_key = cls._access_key(expr.value)
+            if base_key is None:
+                return None
+            index = cls._literal_value(expr.index)
+            if index is not Missing:
+                # Typed, so ``[1]`` and ``[true]`` stay apart.
+                index_key: Optional[Tuple[Any, ...]] = ("literal", type(index), index)
+            else:
+                index_key = cls._access_key(expr.index)
+            if index_key is None:
+                return None
+            return ("index", base_key, index_key)
+        return None
+
+    @staticmethod
+    def _memoize(token: object, evaluate: Evaluator) -> Evaluator:
+        """Evaluate at most once per context; a context's scope and payload never change."""
+
+        def evaluate_memoized(ctx: EvaluationContext) -> Any:
+            memo = ctx.memo
+            if memo is None:
+                memo = ctx.memo = {}
+            elif token in memo:
+                return memo[token]
+            value = evaluate(ctx)
+            memo[token] = value
+            return value
+
+        return evaluate_memoized
+
+    @staticmethod
+    def _literal_value(expr: parser.Expression) -> Any:
+        """Value of a scalar literal node, or ``Missing`` if ``expr`` is not one."""
+        if isinstance(expr, parser.StringLiteral):
+            if "$(" in expr.value:
+                return Missing
+            return expr.value
         if isinstance(expr, parser.NumberLiteral):
             # Prefer int when possible for friendlier outputs.
             return int(expr.value) if expr.value.is_integer() else expr.value
@@ -520,73 +1119,300 @@ class DataWeaveRuntime:
             return expr.value
         if isinstance(expr, parser.NullLiteral):
             return None
-        if isinstance(expr, parser.Identifier):
-            return self._resolve_identifier(
-                expr.name,
-                ctx,
-                line=expr.line,
-                column=expr.column,
-                length=len(expr.name or ""),
-            )
-        if isinstance(expr, parser.PropertyAccess):
-            base = self._evaluate(expr.value, ctx)
+        return Missing
+
+    def _compile_identifier(self, expr: parser.Identifier, state: CompileState) -> Evaluator:
+        """Resolve what can be resolved statically; only variables are looked up per evaluation.
+
+        Mirrors ``_resolve_identifier``: ``payload`` and ``vars`` come first, then
+        builtins, which shadow variables of the same name.
+        """
+        name = expr.name
+        line = expr.line
+        column = expr.column
+        if name == "payload":
+            return lambda ctx: ctx.payload
+        if name == "vars":
+            return lambda ctx: ctx.variables
+        if name in self._builtins:
+            if name == "_binary_plus" and line is not None:
+                # The wrapper reports positions relative to the context's line offset.
+                return lambda ctx: self._resolve_identifier(name, ctx, line=line, column=column)
+            builtin = self._builtins[name]
+            return lambda ctx: builtin
+        length = len(name or "")
+
+        def evaluate_variable(ctx: EvaluationContext) -> Any:
             try:
-                return self._resolve_property(base, expr.attribute)
-            except TypeError:
-                if expr.null_safe:
-                    return None
-                raise
-        if isinstance(expr, parser.IndexAccess):
-            base = self._evaluate(expr.value, ctx)
-            index = self._evaluate(expr.index, ctx)
-            return self._resolve_index(base, index)
-        if isinstance(expr, parser.FunctionCall):
-            function = self._evaluate(expr.function, ctx)
-            placeholder_positions = self._resolve_placeholder_argument_indexes(expr.function)
-            args: List[Any] = []
-            for idx, argument in enumerate(expr.arguments):
-                if idx in placeholder_positions and not isinstance(argument, parser.LambdaExpression):
-                    placeholders = self._collect_placeholders(argument)
-                    if placeholders:
-                        args.append(
-                            ImplicitLambdaCallable(
-                                runtime=self,
-                                body=argument,
-                                closure_variables=dict(ctx.variables),
-                                payload=ctx.payload,
-                                header=ctx.header,
-                                placeholders=placeholders,
-                            )
-                        )
-                        continue
-                args.append(self._evaluate(argument, ctx))
+                return ctx.variables[name]
+            except KeyError:
+                return self._resolve_identifier(
+                    name, ctx, line=line, column=column, length=length
+                )
+
+        return evaluate_variable
+
+    def _compile_function_call(self, expr: parser.FunctionCall, state: CompileState) -> Evaluator:
+        function_expr = expr.function
+        placeholder_positions = self._resolve_placeholder_argument_indexes(expr.function)
+        argument_fns: List[Evaluator] = []
+        for idx, argument in enumerate(expr.arguments):
+            if idx in placeholder_positions and not isinstance(argument, parser.LambdaExpression):
+                placeholders = self._collect_placeholders(argument)
+                if placeholders:
+                    argument_fns.append(
+                        self._compile_implicit_lambda(argument, placeholders, state)
+                    )
+                    continue
+            argument_fns.append(self._compile(argument, state))
+
+        if isinstance(function_expr, parser.Identifier) and function_expr.name in self._builtins:
+            builtin = self._builtins[function_expr.name]
+            if function_expr.name == "_binary_plus" and function_expr.line is not None:
+                return self._compile_plus(builtin, function_expr, argument_fns)
+            if (
+                function_expr.name in _RANGE_CONSUMERS
+                and expr.arguments
+                and self._is_range_call(expr.arguments[0])
+            ):
+                # ``1 to n map ...`` iterates the range without materialising it.
+                start_expr, end_expr = expr.arguments[0].arguments
+                argument_fns[0] = self._compile_range(start_expr, end_expr, state)
+            return self._compile_builtin_call(builtin, expr.arguments, argument_fns)
+
+        function_fn = self._compile(function_expr, state)
+
+        def evaluate_call(ctx: EvaluationContext) -> Any:
+            function = function_fn(ctx)
+            args = [argument_fn(ctx) for argument_fn in argument_fns]
             if not callable(function):
-                raise TypeError(f"Expression {expr.function!r} is not callable")
+                raise TypeError(f"Expression {function_expr!r} is not callable")
             return function(*args)
-        if isinstance(expr, parser.DefaultOp):
-            left_value = self._evaluate(expr.left, ctx)
-            if self._is_missing(left_value):
-                return self._evaluate(expr.right, ctx)
-            return left_value
-        if isinstance(expr, parser.LambdaExpression):
-            return LambdaCallable(
-                runtime=self,
-                parameters=expr.parameters,
-                body=expr.body,
-                closure_variables=dict(ctx.variables),
-                payload=ctx.payload,
-                header=ctx.header,
+
+        return evaluate_call
+
+    def _compile_plus(
+        self,
+        builtin: Callable[..., Any],
+        function_expr: parser.Identifier,
+        argument_fns: List[Evaluator],
+    ) -> Evaluator:
+        """Call ``+`` with its source position, adding small integers inline."""
+        plus_line = function_expr.line
+        plus_column = function_expr.column
+        if len(argument_fns) != 2:
+            return lambda ctx: builtin(
+                *[argument_fn(ctx) for argument_fn in argument_fns],
+                line=plus_line + ctx.line_offset,
+                column=plus_column,
             )
-        if isinstance(expr, parser.IfExpression):
-            condition_value = self._evaluate(expr.condition, ctx)
-            branch = expr.when_true if self._is_truthy(condition_value) else expr.when_false
-            return self._evaluate(branch, ctx)
-        if isinstance(expr, parser.MatchExpression):
-            value = self._evaluate(expr.value, ctx)
-            for case in expr.cases:
-                if case.pattern is None:
-                    return self._evaluate(case.expression, ctx)
-                pattern = case.pattern
+        left_fn, right_fn = argument_fns
+
+        def evaluate_plus(ctx: EvaluationContext) -> Any:
+            left = left_fn(ctx)
+            right = right_fn(ctx)
+            if (
+                type(left) is int
+                and type(right) is int
+                and -_EXACT_INT_BOUND <= left <= _EXACT_INT_BOUND
+                and -_EXACT_INT_BOUND <= right <= _EXACT_INT_BOUND
+            ):
+                return left + right
+            return builtin(left, right, line=plus_line + ctx.line_offset, column=plus_column)
+
+        return evaluate_plus
+
+    def _is_range_call(self, expr: parser.Expression) -> bool:
+        return (
+            isinstance(expr, parser.FunctionCall)
+            and isinstance(expr.function, parser.Identifier)
+            and expr.function.name == "_infix_to"
+            and len(expr.arguments) == 2
+            and type(self)._func_infix_to is DataWeaveRuntime._func_infix_to
+        )
+
+    def _compile_range(
+        self, start_expr: parser.Expression, end_expr: parser.Expression, state: CompileState
+    ) -> Evaluator:
+        start_fn = self._compile(start_expr, state)
+        end_fn = self._compile(end_expr, state)
+        integer_range = builtins.integer_range
+        return lambda ctx: integer_range(start_fn(ctx), end_fn(ctx))
+
+    def _compile_builtin_call(
+        self,
+        builtin: Callable[..., Any],
+        arguments: List[parser.Expression],
+        argument_fns: List[Evaluator],
+    ) -> Evaluator:
+        """Call a statically known builtin, fusing the common one- and two-argument shapes."""
+        if len(argument_fns) == 1:
+            (only_fn,) = argument_fns
+            return lambda ctx: builtin(only_fn(ctx))
+        if len(argument_fns) == 2:
+            left_fn, right_fn = argument_fns
+            # ``x * 2``, ``x == "A"``: the literal operand is passed as is.
+            right_constant = self._literal_value(arguments[1])
+            if right_constant is not Missing:
+                if type(right_constant) in (int, float) and right_constant:
+                    # A non-zero number needs no ``or`` fallback on the right.
+                    if builtin is DataWeaveRuntime._func_binary_times:
+                        return lambda ctx: (left_fn(ctx) or 0) * right_constant
+                    if builtin is DataWeaveRuntime._func_binary_divide:
+                        return lambda ctx: (left_fn(ctx) or 0) / right_constant
+                return lambda ctx: builtin(left_fn(ctx), right_constant)
+            return lambda ctx: builtin(left_fn(ctx), right_fn(ctx))
+        return lambda ctx: builtin(*[argument_fn(ctx) for argument_fn in argument_fns])
+
+    def _compile_identifier_property(
+        self, base_expr: parser.Expression, attribute: str
+    ) -> Optional[Evaluator]:
+        """Fuse ``name.attribute`` into one step when ``name`` is payload or a variable."""
+        if not isinstance(base_expr, parser.Identifier):
+            return None
+        name = base_expr.name
+        if name in self._builtins and name not in ("payload", "vars"):
+            return None
+        resolve_property = self._property_resolver(attribute)
+        if name == "payload":
+            return lambda ctx: resolve_property(ctx.payload)
+        if name == "vars":
+            return lambda ctx: resolve_property(ctx.variables)
+        line = base_expr.line
+        column = base_expr.column
+        length = len(name or "")
+
+        def evaluate_variable_property(ctx: EvaluationContext) -> Any:
+            try:
+                base = ctx.variables[name]
+            except KeyError:
+                base = self._resolve_identifier(
+                    name, ctx, line=line, column=column, length=length
+                )
+            return resolve_property(base)
+
+        return evaluate_variable_property
+
+    def _compile_implicit_lambda(
+        self, body: parser.Expression, placeholders: Set[int], state: CompileState
+    ) -> Evaluator:
+        body_fn = self._compile_scope(body, state, ["$", "$$"])
+        kernel = self._compile_kernel(body, {}, placeholders=True)
+        return lambda ctx: ImplicitLambdaCallable(
+            runtime=self,
+            body=body,
+            closure_variables=ctx.variables,
+            payload=ctx.payload,
+            header=ctx.header,
+            placeholders=placeholders,
+            evaluate_body=body_fn,
+            kernel=kernel,
+        )
+
+    def _compile_kernel(
+        self, body: parser.Expression, arguments: Dict[str, int], *, placeholders: bool
+    ) -> Optional[Kernel]:
+        """Compile a lambda body that only reads its arguments into a plain function of them.
+
+        ``arguments`` maps parameter names to their position; with ``placeholders``
+        ``$`` and ``$$`` are the first two arguments.  Bodies limited to literals,
+        arguments, property selectors and pure operators qualify, which covers the
+        usual numeric ``map``/``filter``/``reduce`` lambdas.  Calling the kernel
+        skips building a scope and context per item.  Returns None otherwise.
+        """
+        if isinstance(body, parser.Identifier):
+            if body.name in arguments:
+                if arguments[body.name] == 0:
+                    return lambda first, second: first
+                return lambda first, second: second
+            return None
+        if isinstance(body, parser.Placeholder):
+            if not placeholders:
+                return None
+            if body.level == 1:
+                return lambda first, second: first
+            return lambda first, second: second
+        constant = self._literal_value(body)
+        if constant is not Missing:
+            return lambda first, second: constant
+        if isinstance(body, parser.PropertyAccess):
+            base = self._compile_kernel(body.value, arguments, placeholders=placeholders)
+            if base is None:
+                return None
+            resolve_property = self._property_resolver(body.attribute)
+            if not body.null_safe:
+                return lambda first, second: resolve_property(base(first, second))
+
+            def null_safe_property(first: Any, second: Any) -> Any:
+                value = base(first, second)
+                try:
+                    return resolve_property(value)
+                except TypeError:
+                    return None
+
+            return null_safe_property
+        if not isinstance(body, parser.FunctionCall):
+            return None
+        function = body.function
+        if not isinstance(function, parser.Identifier) or function.name not in PURE_OPERATORS:
+            return None
+        operands = [
+            self._compile_kernel(argument, arguments, placeholders=placeholders)
+            for argument in body.arguments
+        ]
+        if len(operands) != 2 or None in operands:
+            return None
+        left, right = operands
+        builtin = self._builtins[function.name]
+        if function.name == "_binary_plus" and function.line is not None:
+            # Lambda bodies are evaluated without a line offset.
+            plus_line = function.line
+            plus_column = function.column
+            return lambda first, second: builtin(
+                left(first, second), right(first, second), line=plus_line, column=plus_column
+            )
+        return lambda first, second: builtin(left(first, second), right(first, second))
+
+    def _compile_match(self, expr: parser.MatchExpression, state: CompileState) -> Evaluator:
+        value_fn = self._compile(expr.value, state)
+        cases: List[
+            Tuple[Optional[parser.MatchPattern], Optional[Evaluator], Optional[Evaluator], Evaluator]
+        ] = []
+        for case in expr.cases:
+            pattern = case.pattern
+            matcher_fn = guard_fn = None
+            if pattern is not None:
+                if pattern.matcher is not None:
+                    matcher_fn = self._compile(pattern.matcher, state)
+                if pattern.guard is not None:
+                    guard_fn = self._compile(pattern.guard, state)
+            cases.append((pattern, matcher_fn, guard_fn, self._compile(case.expression, state)))
+
+        # Leading ``case <literal> ->`` arms become a table lookup. Scalars equal to a
+        # literal hash like it, so on a miss the scan resumes after those arms.
+        jump_table: Dict[Any, Evaluator] = {}
+        table_size = 0
+        for pattern, _, _, expression_fn in cases:
+            if pattern is None or pattern.binding or pattern.guard is not None:
+                break
+            expected = self._literal_value(pattern.matcher) if pattern.matcher else Missing
+            if expected is Missing:
+                break
+            jump_table.setdefault(expected, expression_fn)
+            table_size += 1
+        remaining_cases = cases[table_size:]
+
+        def evaluate_match(ctx: EvaluationContext) -> Any:
+            value = value_fn(ctx)
+            scan = cases
+            if table_size and value.__class__ in _SCALAR_TYPES:
+                expression_fn = jump_table.get(value)
+                if expression_fn is not None:
+                    return expression_fn(ctx)
+                scan = remaining_cases
+            for pattern, matcher_fn, guard_fn, expression_fn in scan:
+                if pattern is None:
+                    return expression_fn(ctx)
                 match_context = ctx
                 if pattern.binding:
                     bound_variables = dict(ctx.variables)
@@ -597,20 +1423,17 @@ class DataWeaveRuntime:
                         header=ctx.header,
                     )
                 matches = True
-                if pattern.matcher is not None:
-                    expected = self._evaluate(pattern.matcher, ctx)
+                if matcher_fn is not None:
+                    expected = matcher_fn(ctx)
                     matches = self._match_values(value, expected)
-                if matches and pattern.guard is not None:
-                    guard_value = self._evaluate(pattern.guard, match_context)
+                if matches and guard_fn is not None:
+                    guard_value = guard_fn(match_context)
                     matches = self._is_truthy(guard_value)
                 if matches:
-                    return self._evaluate(case.expression, match_context)
+                    return expression_fn(match_context)
             return None
-        if isinstance(expr, parser.TypeCoercion):
-            value = self._evaluate(expr.expression, ctx)
-            options = self._evaluate(expr.options, ctx) if expr.options else None
-            return self._coerce_value(value, expr.target, options, ctx)
-        raise TypeError(f"Unsupported expression: {expr!r}")
+
+        return evaluate_match
 
     def _resolve_identifier(
         self,
@@ -651,6 +1474,22 @@ class DataWeaveRuntime:
             length=max(length, 1),
         )
 
+    def _property_resolver(self, attribute: str) -> Callable[[Any], Any]:
+        """Return ``_resolve_property`` for a fixed attribute, with plain dicts read inline."""
+        resolve_property = self._resolve_property
+        if attribute.startswith(("*", "@")):
+            return lambda base: resolve_property(base, attribute)
+
+        def resolve(base: Any) -> Any:
+            if base.__class__ is dict:
+                value = base.get(attribute)
+                if value.__class__ is XMLNodeList:
+                    return value[0] if value else None
+                return value
+            return resolve_property(base, attribute)
+
+        return resolve
+
     def _resolve_property(self, base: Any, attribute: str) -> Any:
         if base is None:
             return None
@@ -717,19 +1556,40 @@ class DataWeaveRuntime:
         return results
 
     def _resolve_index(self, base: Any, index: Any) -> Any:
+        base_type = base.__class__
+        if base_type is list or base_type is tuple:
+            return self._resolve_index_sequence(base, index)
+        if base_type is dict:
+            return self._resolve_index_mapping(base, index)
         if base is None:
             return None
         if isinstance(base, (list, tuple)):
+            return self._resolve_index_sequence(base, index)
+        if isinstance(base, dict):
+            return self._resolve_index_mapping(base, index)
+        return self._resolve_index_other(base, index)
+
+    @staticmethod
+    def _resolve_index_sequence(base: Union[List[Any], Tuple[Any, ...]], index: Any) -> Any:
+        if index.__class__ is int:
+            idx = index
+        else:
             try:
                 idx = int(index)
             except (TypeError, ValueError):
                 return None
-            if idx < 0 or idx >= len(base):
-                return None
+        if 0 <= idx < len(base):
             return base[idx]
-        if isinstance(base, dict):
-            key = str(index)
-            return base.get(key, None)
+        return None
+
+    @staticmethod
+    def _resolve_index_mapping(base: Dict[Any, Any], index: Any) -> Any:
+        return base.get(index if index.__class__ is str else str(index), None)
+
+    @staticmethod
+    def _resolve_index_other(base: Any, index: Any) -> Any:
+        if getattr(base, "__getitem__", None) is None:
+            return None
         try:
             return base[index]
         except (TypeError, KeyError, IndexError):
@@ -777,11 +1637,13 @@ class DataWeaveRuntime:
         line: Optional[int] = None,
         column: Optional[int] = None,
     ) -> Any:
-        def is_period(value: Any) -> bool:
-            return isinstance(value, timedelta)
-
-        def ensure_datetime(value: datetime, delta: timedelta) -> datetime:
-            return value + delta
+        if (
+            type(left) is int
+            and type(right) is int
+            and -_EXACT_INT_BOUND <= left <= _EXACT_INT_BOUND
+            and -_EXACT_INT_BOUND <= right <= _EXACT_INT_BOUND
+        ):
+            return left + right
 
         if isinstance(left, (int, float, bool)) and isinstance(right, (int, float, bool)):
             left_num = float(left)
@@ -789,6 +1651,12 @@ class DataWeaveRuntime:
             result = left_num + right_num
             return int(result) if result.is_integer() else result
 
+        def is_period(value: Any) -> bool:
+            return isinstance(value, timedelta)
+
+        def ensure_datetime(value: datetime, delta: timedelta) -> datetime:
+            return value + delta
+
         if isinstance(left, list):
             result_list = list(left)
             result_list.append(right)
@@ -845,6 +1713,17 @@ class DataWeaveRuntime:
             return list(value.values())
         return list(value)
 
+    @staticmethod
+    def _iterate(value: Any) -> Iterable[Any]:
+        """Like ``_to_iterable`` but without copying; for callers that only loop once."""
+        if value is None:
+            return ()
+        if isinstance(value, (list, tuple)):
+            return value
+        if isinstance(value, Mapping):
+            return value.values()
+        return value
+
     def _prepare_sequence_callable(self, function: Any) -> Callable[..., Any]:
         if callable(function):
             return function
@@ -855,43 +1734,62 @@ class DataWeaveRuntime:
 
         return constant_callable
 
+    @staticmethod
+    def _lambda_kernel(function: Any) -> Optional[Kernel]:
+        if isinstance(function, (LambdaCallable, ImplicitLambdaCallable)):
+            return function.kernel
+        return None
+
+    def _sequence_call(self, function: Any) -> Callable[[Any, int], Any]:
+        """Return the lambda given to map, filter or flatMap as a function of ``(item, index)``.
+
+        Lambdas compiled to a kernel are called through it directly, which keeps
+        the whole loop free of scope and context allocation.
+        """
+        kernel = self._lambda_kernel(function)
+        if kernel is not None:
+            return kernel
+        return builtins.bind_lambda(self._prepare_sequence_callable(function), 2)
+
     def _func_infix_map(self, sequence: Any, function: Callable[..., Any]) -> List[Any]:
-        callable_function = self._prepare_sequence_callable(function)
-        result: List[Any] = []
-        for index, item in enumerate(self._to_iterable(sequence)):
-            result.append(builtins.invoke_lambda(callable_function, item, index))
-        return result
+        call = self._sequence_call(function)
+        return [
+            call(item, index)
+            for index, item in enumerate(self._iterate(sequence))
+        ]
 
     def _func_infix_reduce(self, sequence: Any, function: Callable[..., Any]) -> Any:
-        iterable = self._to_iterable(sequence)
-        accumulator = Missing
-        param_count = builtins.parameter_count(function)
-        for item in iterable:
-            if accumulator is Missing:
-                accumulator = builtins.invoke_lambda(function, item)
-            else:
-                if param_count and param_count > 1:
-                    accumulator = function(item, accumulator)
-                else:
-                    accumulator = function(item)
-        if accumulator is Missing:
+        items = iter(self._iterate(sequence))
+        first = next(items, Missing)
+        if first is Missing:
             return None
+        # The first item seeds the accumulator through the lambda's default.
+        accumulator = builtins.invoke_lambda(function, first)
+        param_count = builtins.parameter_count(function)
+        if param_count and param_count > 1:
+            step = self._lambda_kernel(function) or function
+            for item in items:
+                accumulator = step(item, accumulator)
+        else:
+            for item in items:
+                accumulator = function(item)
         return accumulator
 
     def _func_infix_filter(self, sequence: Any, function: Callable[..., Any]) -> List[Any]:
-        callable_function = self._prepare_sequence_callable(function)
-        result: List[Any] = []
-        for index, item in enumerate(self._to_iterable(sequence)):
-            if self._is_truthy(builtins.invoke_lambda(callable_function, item, index)):
-                result.append(item)
-        return result
+        call = self._sequence_call(function)
+        is_truthy = self._is_truthy
+        return [
+            item
+            for index, item in enumerate(self._iterate(sequence))
+            if is_truthy(call(item, index))
+        ]
 
     def _func_infix_flat_map(self, sequence: Any, function: Callable[..., Any]) -> List[Any]:
-        callable_function = self._prepare_sequence_callable(function)
+        call = self._sequence_call(function)
         result: List[Any] = []
-        for index, item in enumerate(self._to_iterable(sequence)):
-            mapped = builtins.invoke_lambda(callable_function, item, index)
-            result.extend(self._to_iterable(mapped))
+        extend = result.extend
+        for index, item in enumerate(self._iterate(sequence)):
+            extend(self._iterate(call(item, index)))
         return result
 
     def _func_infix_distinct_by(self, sequence: Any, function: Callable[..., Any]) -> List[Any]:
@@ -899,13 +1797,14 @@ class DataWeaveRuntime:
         items = list(self._to_iterable(sequence))
         if callable_function is None:
             return items
-        seen = []
+        call = builtins.bind_lambda(callable_function, 2)
+        hashable = builtins._hashable_key
+        seen: Set[Any] = set()
         result: List[Any] = []
         for index, item in enumerate(items):
-            key = builtins.invoke_lambda(callable_function, item, index)
-            marker = builtins._hashable_key(key)
+            marker = hashable(call(item, index))
             if marker not in seen:
-                seen.append(marker)
+                seen.add(marker)
                 result.append(item)
         return result
 
@@ -1324,33 +2223,29 @@ class DataWeaveRuntime:
         options: Any,
         ctx: EvaluationContext,
     ) -> Any:
-        target_name = (type_spec.name or "Any").strip()
-        normalised = target_name.lower()
+        return self._coercer(type_spec)(value, options, ctx)
+
+    def _coercer(self, type_spec: parser.TypeSpec) -> Callable[[Any, Any, EvaluationContext], Any]:
+        """Pick the coercion for ``type_spec`` once; it is called as ``(value, options, ctx)``."""
+        normalised = (type_spec.name or "Any").strip().lower()
         if normalised == "null":
-            return None
-        if value is None:
-            if normalised == "array":
-                return []
-            if normalised == "object":
-                return {}
-            return None
-        if normalised == "any":
-            return value
-        if normalised == "number":
-            return self._coerce_number(value)
-        if normalised == "string":
-            return self._coerce_string(value)
-        if normalised in {"boolean", "bool"}:
-            return self._coerce_boolean(value)
-        if normalised == "binary":
-            return self._coerce_binary(value)
+            return lambda value, options, ctx: None
+        generics = type_spec.generics
         if normalised == "array":
-            return self._coerce_array(value, type_spec.generics, options, ctx)
+            coerce_array = self._coerce_array
+            return lambda value, options, ctx: (
+                [] if value is None else coerce_array(value, generics, options, ctx)
+            )
         if normalised == "object":
-            return self._coerce_object(value, type_spec.generics, options, ctx)
-        if normalised == "date" or normalised == "datetime":
-            return self._coerce_string(value)
-        return value
+            coerce_object = self._coerce_object
+            return lambda value, options, ctx: (
+                {} if value is None else coerce_object(value, generics, options, ctx)
+            )
+        convert = self._scalar_coercions.get(normalised)
+        if convert is None:
+            # ``Any`` and types without a conversion pass the value through.
+            return lambda value, options, ctx: value
+        return lambda value, options, ctx: None if value is None else convert(value)
 
     @staticmethod
     def _coerce_number(value: Any) -> Any:
@@ -1418,11 +2313,8 @@ class DataWeaveRuntime:
         iterable = self._to_iterable(value)
         if not generics:
             return list(iterable)
-        coerced: List[Any] = []
-        inner_type = generics[0]
-        for item in iterable:
-            coerced.append(self._coerce_value(item, inner_type, options, ctx))
-        return coerced
+        coerce = self._coercer(generics[0])
+        return [coerce(item, options, ctx) for item in iterable]
 
     def _coerce_object(
         self,
@@ -1435,9 +2327,9 @@ class DataWeaveRuntime:
             raise TypeError(f"Cannot coerce {type(value).__name__} to Object")
         result: Dict[str, Any] = {}
         if generics:
-            inner_type = generics[0]
+            coerce = self._coercer(generics[0])
             for key, item in value.items():
-                result[str(key)] = self._coerce_value(item, inner_type, options, ctx)
+                result[str(key)] = coerce(item, options, ctx)
             return result
         for key, item in value.items():
             result[str(key)] = item
@@ -1,10 +1,15 @@
+import datetime
+import gc
 import json
 from pathlib import Path
 import textwrap
+import uuid
+import weakref
 
 import pandas as pd
 import pytest
 
+import dwpy.formats as formats
 import dwpy.parser as parser
 from dwpy.runtime import DataWeaveRuntime, DataWeaveEvaluationError
 
@@ -147,6 +152,56 @@ output application/python
     assert result == {"upper": "MULE"}
 
 
+def test_payload_accepts_json_bytes_when_format_specified():
+    script = """%dw 2.0
+output application/python
+---
+payload.items map ((item) -> item.name)
+"""
+    payload = '{"items": [{"name": "café"}, {"name": "mule"}]}'.encode("utf-8")
+    runtime = DataWeaveRuntime()
+
+    result = runtime.execute(
+        script,
+        payload=payload,
+        payload_format="application/json",
+    )
+
+    assert result == ["café", "mule"]
+
+
+def test_output_json_without_ascii_escaping_keeps_unicode():
+    script = """%dw 2.0
+output application/json ensure_ascii=false indent=2
+---
+{
+  city: payload.city,
+  tags: ["a", "b"]
+}
+"""
+    runtime = DataWeaveRuntime()
+
+    raw = runtime.execute(script, payload={"city": "Zürich"})
+
+    assert raw == '{\n  "city": "Zürich",\n  "tags": [\n    "a",\n    "b"\n  ]\n}'
+
+
+def test_string_literals_keep_non_ascii_characters():
+    script = r"""%dw 2.0
+output application/python
+---
+{
+  city: "Zürich",
+  note: "café\tok"
+}
+"""
+    runtime = PythonResultRuntime()
+
+    result = runtime.execute(script, payload={})
+
+    assert result == {"city": "Zürich", "note": "café\tok"}
+
+
 def test_payload_accepts_dataframe_input():
     script = """%dw 2.0
 output application/json
@@ -292,6 +347,111 @@ payload[0].city
     assert result == "Lisbon"
 
 
+def test_payload_csv_pyarrow_engine_matches_default_reader():
+    pytest.importorskip("pyarrow")
+    script = """%dw 2.0
+output application/python
+---
+payload
+"""
+    csv_input = textwrap.dedent(
+        """\
+        name,city,zip
+        Ana,London,
+        "Bob, Jr.",Berlin,10115
+        """
+    ).strip()
+    runtime = PythonResultRuntime()
+
+    default_result = runtime.execute(script, payload=csv_input, payload_format="csv")
+    arrow_result = runtime.execute(
+        script,
+        payload=csv_input,
+        payload_format="csv",
+        payload_format_options={"engine": "pyarrow"},
+    )
+
+    assert arrow_result == default_result == [
+        {"name": "Ana", "city": "London", "zip": ""},
+        {"name": "Bob, Jr.", "city": "Berlin", "zip": "10115"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "document",
+    ['42', '"s"', "null", "1.5", "true", '[1, {"a": [2, null]}]', '{"a": {"b": "é"}}'],
+)
+def test_json_reader_cysimdjson_matches_stdlib(monkeypatch, document):
+    pytest.importorskip("cysimdjson")
+
+    native = formats.FormatRegistry.read(document, "json", {})
+    monkeypatch.setattr(formats, "CYSIMDJSON_AVAILABLE", False)
+    monkeypatch.setattr(formats, "ORJSON_AVAILABLE", False)
+    stdlib = formats.FormatRegistry.read(document, "json", {})
+
+    assert native == stdlib
+    assert type(native) is type(stdlib)
+
+
+def _write_json_outcome(value, options):
+    try:
+        return formats.FormatRegistry.write(value, "json", options)
+    except Exception as err:  # compared by type and message
+        return type(err), str(err)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"name": "Ana", "items": [1, 2.5, True, None], "nested": {"b": "é"}},
+        {"x": float("nan")},
+        [float("inf"), float("-inf")],
+        {"when": datetime.date(2024, 1, 2)},
+        {"id": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+        {"a": 1e-7},
+        {"a": 1e16},
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_writer_orjson_matches_stdlib(monkeypatch, value, indent):
+    pytest.importorskip("orjson")
+    options = {"ensure_ascii": False, "indent": indent, "sort_keys": True}
+
+    native = _write_json_outcome(value, options)
+    monkeypatch.setattr(formats, "ORJSON_AVAILABLE", False)
+    stdlib = _write_json_outcome(value, options)
+
+    assert native == stdlib
+
+
+@pytest.mark.parametrize(
+    "csv_input",
+    ['name,city\nAna,London,extra\nBob\n', 'name,city\n"Ana\nMaria",London\n'],
+    ids=["ragged-rows", "quoted-newline"],
+)
+def test_payload_csv_pyarrow_engine_falls_back_like_default_reader(csv_input):
+    pytest.importorskip("pyarrow")
+    script = """%dw 2.0
+output application/python
+---
+payload
+"""
+    runtime = PythonResultRuntime()
+
+    default_result = runtime.execute(script, payload=csv_input, payload_format="csv")
+    arrow_result = runtime.execute(
+        script,
+        payload=csv_input,
+        payload_format="csv",
+        payload_format_options={"engine": "pyarrow"},
+    )
+
+    assert arrow_result == default_result
+    if "extra" in csv_input:
+        # Arrow rejects ragged rows; the reader hands them to the csv module.
+        assert formats._arrow_csv_records(csv_input, ",", '"') is None
+
+
 def test_payload_xml_parsing_with_wildcard_selection():
     runtime = DataWeaveRuntime()
     script = """%dw 2.0
@@ -325,6 +485,23 @@ type Currency = String { format: "\\$#,###.00" }
     assert prices == ["22.30", "20.31"]
 
 
+def test_payload_xml_parses_deeply_nested_documents():
+    depth = 300
+    xml_payload = "<n>" * depth + "leaf" + "</n>" * depth
+    script = """%dw 2.0
+output application/python
+---
+payload
+"""
+    runtime = PythonResultRuntime()
+
+    result = runtime.execute(script, payload=xml_payload, payload_format="application/xml")
+
+    for _ in range(depth):
+        result = result["n"]
+    assert result == "leaf"
+
+
 XML_TREE_PAYLOAD = """<root>
     <name>John</name>
     <children>
@@ -561,6 +738,37 @@ output application/json
     assert result_small["bucket"] == "small"
 
 
+def test_match_expression_literal_cases_fall_through_to_guards():
+    script = """%dw 2.0
+output application/json
+---
+payload map ($ match {
+  case 1 -> "one",
+  case "two" -> "two",
+  case 1 -> "shadowed",
+  case var value when value > 3 -> "big",
+  else -> "other"
+})
+"""
+    runtime = PythonResultRuntime()
+
+    result = runtime.execute(script, payload=[1, 1.0, "two", 5, 2])
+
+    assert result == ["one", "one", "two", "big", "other"]
+
+
+def test_zero_argument_calls_get_their_own_argument_lists():
+    script = parser.parse_script("""%dw 2.0
+---
+[now(), now()]
+""")
+    first, second = script.body.elements
+
+    first.arguments.append(parser.NumberLiteral(value=1.0))
+
+    assert second.arguments == []
+
+
 def test_index_selector_and_header_reference():
     script = """%dw 2.0
 output application/json
@@ -624,6 +832,12 @@ output application/json
     assert "column" in message
 
 
+@pytest.mark.parametrize("directive", ["import", "type"])
+def test_bare_header_keyword_is_unsupported(directive):
+    with pytest.raises(parser.ParseError, match="Unsupported header directive"):
+        parser.parse_script(f"%dw 2.0\n{directive}\n---\n1")
+
+
 def test_fixture_parity_sample_script():
     script_path = FIXTURES_DIR / "sample_script.dwl"
     payload_path = FIXTURES_DIR / "sample_input.json"
@@ -992,3 +1206,223 @@ processNode(payload)
         "Other Charges",
         "Storage",
     ]
+
+
+def test_repeated_property_access_is_evaluated_per_item():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+---
+payload map ((item) -> {
+  area: item.size.w * item.size.h,
+  square: item.size.w == item.size.h,
+  label: item.size.w match {
+    case var w when w > 2 -> item.size.h
+    else -> item.size.w
+  }
+})
+"""
+    payload = [{"size": {"w": 2, "h": 3}}, {"size": {"w": 4, "h": 4}}]
+
+    result = runtime.execute(script, payload)
+
+    assert result == [
+        {"area": 6, "square": False, "label": 2},
+        {"area": 16, "square": True, "label": 4},
+    ]
+
+
+def test_lambda_bodies_reuse_values_that_ignore_their_arguments():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+var limit = payload.limit
+var scale = 10
+---
+payload.values map ((scale) -> {
+  scaled: scale * limit,
+  kept: scale match {
+    case var limit when limit > 1 -> limit
+    else -> payload.limit + 0
+  }
+})
+"""
+
+    result = runtime.execute(script, {"limit": 3, "values": [1, 2]})
+
+    assert result == [{"scaled": 3, "kept": 3}, {"scaled": 6, "kept": 2}]
+
+
+def _count_parses(monkeypatch):
+    parsed = []
+    parse_script = parser.parse_script
+
+    def counting_parse_script(source):
+        parsed.append(source)
+        return parse_script(source)
+
+    monkeypatch.setattr(parser, "parse_script", counting_parse_script)
+    return parsed
+
+
+def test_repeated_scripts_are_compiled_once_and_rerun_per_payload(monkeypatch):
+    parsed = _count_parses(monkeypatch)
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+var doubled = payload map ($ * 2)
+---
+{ total: sum(doubled), first: doubled[0] }
+"""
+
+    first = runtime.execute(script, [1, 2, 3])
+    second = runtime.execute(script, [5])
+
+    assert first == {"total": 12, "first": 2}
+    assert second == {"total": 10, "first": 10}
+    assert parsed == [script]
+
+
+def test_script_cache_evicts_the_oldest_script_first(monkeypatch):
+    parsed = _count_parses(monkeypatch)
+    runtime = PythonResultRuntime()
+    scripts = [f"%dw 2.0\n---\n{number}\n" for number in range(257)]
+
+    for number, script in enumerate(scripts):
+        assert runtime.execute(script, None) == number
+    # The cache holds 256 scripts, so running all 257 dropped the first one.
+    runtime.execute(scripts[-1], None)
+    runtime.execute(scripts[1], None)
+    assert len(parsed) == 257
+    assert runtime.execute(scripts[0], None) == 0
+    assert len(parsed) == 258
+    assert parsed[-1] == scripts[0]
+
+
+def test_arithmetic_with_literal_operands_keeps_number_semantics():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+---
+payload map {
+  sum: $ + 1,
+  scaled: $ * 3,
+  half: $ / 2
+}
+"""
+
+    result = runtime.execute(script, [2, 1.5, 0])
+
+    assert result == [
+        {"sum": 3, "scaled": 6, "half": 1.0},
+        {"sum": 2.5, "scaled": 4.5, "half": 0.75},
+        {"sum": 1, "scaled": 0, "half": 0.0},
+    ]
+
+
+def test_nested_lambdas_see_the_current_outer_arguments():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+var limit = 2
+---
+payload map ((row) -> {
+  scaled: row.values map ((value) -> value * row.factor),
+  kept: row.values filter ((value) -> value > limit)
+})
+"""
+    payload = [
+        {"factor": 10, "values": [1, 2, 3]},
+        {"factor": 100, "values": [3, 4]},
+    ]
+
+    result = runtime.execute(script, payload)
+
+    assert result == [
+        {"scaled": [10, 20, 30], "kept": [3]},
+        {"scaled": [300, 400], "kept": [3, 4]},
+    ]
+
+
+def test_argument_only_lambda_bodies_match_scoped_evaluation():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+---
+{
+  totals: payload map ($.price * $.qty + 1),
+  indexed: payload map ((item, index) -> item.qty + index),
+  cheap: (payload filter ((item) -> item.price < 5)) map $.qty,
+  sum: (payload map $.qty) reduce ((qty, acc = 0) -> acc + qty),
+  outer: (payload map ((item) -> item.qty)) map ((qty) -> [1] map ($ + qty))
+}
+"""
+    payload = [{"price": 2, "qty": 3}, {"price": 7.5, "qty": 2}]
+
+    result = runtime.execute(script, payload)
+
+    assert result == {
+        "totals": [7, 16],
+        "indexed": [3, 3],
+        "cheap": [3],
+        "sum": 5,
+        "outer": [[4], [3]],
+    }
+
+
+def test_ranges_feed_sequence_operators_and_render_as_arrays():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+---
+{
+  doubled: (1 to 5) map ($ * 2),
+  plain: 1 to 3,
+  descending: (3 to 1) filter ($ > 1),
+  total: (1 to 4) reduce ((x, acc = 0) -> acc + x)
+}
+"""
+
+    result = runtime.execute(script, None)
+
+    assert result == {
+        "doubled": [2, 4, 6, 8, 10],
+        "plain": [1, 2, 3],
+        "descending": [3, 2],
+        "total": 10,
+    }
+
+
+def test_finished_execution_does_not_keep_its_payload_alive():
+    class Blob:
+        pass
+
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+---
+payload.rows map ((row) -> row + 1)
+"""
+    blob = Blob()
+    blob_ref = weakref.ref(blob)
+
+    result = runtime.execute(script, {"rows": [1, 2], "blob": blob})
+    del blob
+    gc.collect()
+
+    assert result == [2, 3]
+    assert blob_ref() is None
+
+
+def test_null_safe_selector_does_not_hide_errors_in_its_base():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+---
+("a" * "b")?.x
+"""
+
+    with pytest.raises(TypeError):
+        runtime.execute(script, None)
+
+
+def test_null_safe_selector_in_argument_only_lambda_keeps_base_errors():
+    runtime = PythonResultRuntime()
+    script = """%dw 2.0
+---
+payload map ((x) -> (x * "b")?.y)
+"""
+
+    with pytest.raises(TypeError):
+        runtime.execute(script, ["a"])